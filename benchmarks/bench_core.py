@@ -0,0 +1,207 @@
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import timeit
+import tracemalloc
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from logic.board import Board
+from logic.position import Position
+
+# Fixed positions; the long history is a seeded random game so it is identical on every run
+POSITIONS = {
+    'opening': "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1",
+    'middlegame': "r2q1rk1/pp2bppp/2n1pn2/3p4/3P4/2NBPN2/PP3PPP/R2Q1RK1 w - - 0 10",
+    'endgame': "2r3k1/5ppp/p3p3/1p1pP3/3P4/P1R2N2/1P3PPP/6K1 b - - 0 28",
+}
+LONG_HISTORY_PLIES = 200
+LONG_HISTORY_SEED = 7
+
+PIECE_NAMES = {'P': 'pawn', 'N': 'knight', 'B': 'bishop', 'R': 'rook', 'Q': 'queen', 'K': 'king'}
+
+
+def long_history_board():
+    # Replay seeded random legal moves until the board has a 200-ply history
+    seed = LONG_HISTORY_SEED
+    while True:
+        rng = random.Random(seed)
+        board = Board()
+        while len(board.move_history) < LONG_HISTORY_PLIES:
+            moves = board.legal_moves()
+            if not moves:
+                break
+            start, end = rng.choice(moves)
+            board.apply_move(start, end)
+        if len(board.move_history) == LONG_HISTORY_PLIES:
+            return board
+        seed += 1  # Game ended early, try the next seed
+
+
+def build_boards():
+    boards = {name: Board.from_fen(fen) for name, fen in POSITIONS.items()}
+    boards['long_history'] = long_history_board()
+    return boards
+
+
+def board_cases(name, board):
+    # (case name, zero-argument callable) pairs for one position
+    color = board.current_turn()
+    cases = []
+
+    for symbol, piece_name in PIECE_NAMES.items():
+        squares = [(r, c) for r in range(8) for c in range(8)
+                   if board.board[r][c] and board.board[r][c].color == color
+                   and board.board[r][c].symbol == symbol]
+        if squares:
+            def legal_moves(squares=squares):
+                for pos in squares:
+                    board.board[pos[0]][pos[1]].get_legal_moves(board.board, pos, board.en_passant_target)
+            cases.append((f"{name}/get_legal_moves/{piece_name}", legal_moves))
+
+    candidates = [(r, c, move) for r in range(8) for c in range(8)
+                  if board.board[r][c] and board.board[r][c].color == color
+                  for move in board.board[r][c].get_legal_moves(board.board, (r, c), board.en_passant_target)]
+
+    def puts_king_in_check():
+        for r, c, move in candidates:
+            board.move_puts_king_in_check((r, c), move)
+
+    cases.append((f"{name}/move_puts_king_in_check", puts_king_in_check))
+    cases.append((f"{name}/is_checkmate", lambda: board.is_checkmate(color)))
+    cases.append((f"{name}/is_stalemate", lambda: board.is_stalemate(color)))
+    cases.append((f"{name}/get_board_hash", board.get_board_hash))
+
+    position = Position.from_board(board)
+    position_moves = position.legal_moves()
+
+    def apply_all():
+        for move in position_moves:
+            position.apply(move)
+
+    cases.append((f"{name}/position_legal_moves", position.legal_moves))
+    cases.append((f"{name}/position_apply", apply_all))
+    return cases
+
+
+def gui_cases(boards):
+    # Off-screen draw_board on a withdrawn Tk window; skipped without Tk/PIL or a display
+    try:
+        from gui.gui import ChessGUI
+        gui = ChessGUI(boards['middlegame'])
+    except Exception as error:
+        print(f"skipping draw_board: {type(error).__name__}: {error}", file=sys.stderr)
+        return [], None
+    gui.window.withdraw()
+    cases = []
+    for name, board in boards.items():
+        def draw(board=board):
+            gui.board = board
+            gui.turn = board.current_turn()
+            gui.draw_board()
+        cases.append((f"{name}/draw_board", draw))
+    return cases, gui
+
+
+def time_case(func, repeat, min_time):
+    # Best-of-repeat time per call in microseconds, auto-scaling the loop count
+    timer = timeit.Timer(func)
+    number, elapsed = timer.autorange()
+    number = max(1, int(number * min_time / max(elapsed, 1e-9)))
+    best = min(timer.repeat(repeat=repeat, number=number))
+    return best / number * 1e6
+
+
+def memory_case(func):
+    # Peak and retained bytes allocated by one call
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    func()
+    after, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak - before, after - before
+
+
+def run(repeat=5, min_time=0.2, include_gui=True, only=None):
+    boards = build_boards()
+    cases = []
+    for name, board in boards.items():
+        cases.extend(board_cases(name, board))
+    gui = None
+    if include_gui:
+        extra, gui = gui_cases(boards)
+        cases.extend(extra)
+
+    results = {}
+    for case_name, func in cases:
+        if only and only not in case_name:
+            continue
+        func()  # Warm up caches before timing
+        time_us = time_case(func, repeat, min_time)
+        peak, retained = memory_case(func)
+        results[case_name] = {'time_us': round(time_us, 3), 'peak_bytes': peak, 'retained_bytes': retained}
+        print(f"{case_name:<48} {time_us:12.1f} us  peak {peak / 1024:9.1f} KiB")
+
+    if gui is not None:
+        gui.window.destroy()
+    return {
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'results': results,
+    }
+
+
+def compare(current, baseline, time_threshold, memory_threshold):
+    # List of regression messages; cases missing from either side are ignored
+    failures = []
+    for name, new in current['results'].items():
+        old = baseline['results'].get(name)
+        if old is None:
+            continue
+        if new['time_us'] > old['time_us'] * (1 + time_threshold):
+            failures.append(f"{name}: time {old['time_us']:.1f} -> {new['time_us']:.1f} us")
+        # Ignore tiny allocations where a few bytes of noise would dominate
+        if new['peak_bytes'] > max(old['peak_bytes'] * (1 + memory_threshold), old['peak_bytes'] + 4096):
+            failures.append(f"{name}: peak memory {old['peak_bytes']} -> {new['peak_bytes']} bytes")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Core Board/GUI microbenchmarks with regression check")
+    parser.add_argument("--save", metavar="PATH", help="write results as a JSON baseline")
+    parser.add_argument("--baseline", metavar="PATH", help="compare against a saved baseline")
+    parser.add_argument("--threshold", type=float, default=0.20,
+                        help="allowed slowdown as a fraction (default 0.20 = 20%%)")
+    parser.add_argument("--memory-threshold", type=float, default=0.20,
+                        help="allowed growth in peak allocation as a fraction")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--min-time", type=float, default=0.2, help="seconds per timing run")
+    parser.add_argument("--no-gui", action="store_true", help="skip the draw_board cases")
+    parser.add_argument("--only", help="run only cases whose name contains this text")
+    args = parser.parse_args()
+
+    current = run(args.repeat, args.min_time, not args.no_gui, args.only)
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(current, f, indent=2, sort_keys=True)
+        print(f"saved baseline to {args.save}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        failures = compare(current, baseline, args.threshold, args.memory_threshold)
+        if failures:
+            print("Regressions:")
+            for failure in failures:
+                print("  " + failure)
+            sys.exit(1)
+        print("No regressions against baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from logic.board import Board
+from logic.encoding import encode_positions
+from logic.evaluation import evaluate, evaluate_batch
+
+# Fixed sample positions (opening, middlegame, endgame), repeated to fill the batch
+SAMPLE_FENS = [
+    "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1",
+    "r1bqkb1r/pppp1ppp/2n2n2/4p3/2B1P3/5N2/PPPP1PPP/RNBQK2R w KQkq - 4 4",
+    "r2q1rk1/pp2bppp/2n1pn2/3p4/3P4/2NBPN2/PP3PPP/R2Q1RK1 w - - 0 10",
+    "2r3k1/5ppp/p3p3/1p1pP3/3P4/P1R2N2/1P3PPP/6K1 b - - 0 28",
+    "8/5pk1/6p1/7p/P6P/6P1/5PK1/8 w - - 0 45",
+    "8/8/4k3/8/2K5/8/3P4/8 w - - 0 60",
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-board vs batched NumPy evaluation")
+    parser.add_argument("--positions", type=int, default=20000, help="batch size")
+    parser.add_argument("--repeat", type=int, default=3, help="best-of-N timing runs")
+    args = parser.parse_args()
+
+    fens = [SAMPLE_FENS[i % len(SAMPLE_FENS)] for i in range(args.positions)]
+    boards = [Board.from_fen(fen) for fen in fens]
+
+    def best_of(fn):
+        best = float("inf")
+        result = None
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            result = fn()
+            best = min(best, time.perf_counter() - start)
+        return best, result
+
+    python_time, python_scores = best_of(lambda: [evaluate(board) for board in boards])
+    encode_time, codes = best_of(lambda: encode_positions(boards))
+    fen_encode_time, _ = best_of(lambda: encode_positions(fens))
+    batch_time, batch_scores = best_of(lambda: evaluate_batch(codes))
+
+    if list(batch_scores) != python_scores:
+        sys.exit("Batched scores disagree with per-board evaluation")
+
+    n = args.positions
+    print(f"positions:              {n}")
+    print(f"per-board Python eval:  {python_time:8.3f}s  {n / python_time:12,.0f} pos/s")
+    print(f"encode Boards:          {encode_time:8.3f}s  {n / encode_time:12,.0f} pos/s")
+    print(f"encode FEN strings:     {fen_encode_time:8.3f}s  {n / fen_encode_time:12,.0f} pos/s")
+    print(f"batched NumPy eval:     {batch_time:8.3f}s  {n / batch_time:12,.0f} pos/s")
+    print(f"eval speedup:           {python_time / batch_time:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
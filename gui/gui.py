@@ -1,6 +1,10 @@
 import tkinter as tk
 from PIL import Image, ImageTk
 import sys, os
+import copy
+import multiprocessing
+import queue
+import threading
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 # Import custom logic
@@ -9,6 +13,16 @@ from logic.piece import Queen
 from logic.piece import Rook
 from logic.piece import Bishop
 from logic.piece import Knight
+from logic.annotate import annotate_board, format_annotation
+from logic.position import Position
+
+
+# Messages for Board.get_draw_status()
+DRAW_MESSAGES = {
+    'threefold': "threefold repetition",
+    'fifty-move': "the fifty-move rule",
+    'seventy-five-move': "the seventy-five-move rule",
+}
 
 
 def resource_path(relative_path):
@@ -32,6 +46,10 @@ class ChessGUI:
         restart_btn = tk.Button(self.window, text="Restart Game", command=self.restart_game)
         restart_btn.pack(pady=5)
 
+        # Annotate button (evaluates every move played so far)
+        annotate_btn = tk.Button(self.window, text="Annotate Game", command=self.annotate_game)
+        annotate_btn.pack(pady=5)
+
         self.game_over = False
         self.board = board
 
@@ -96,11 +114,7 @@ class ChessGUI:
 
         if piece and piece.color == self.turn:
             # Filter out illegal moves that leave king in check
-            legal_moves = piece.get_legal_moves(self.board.board, (from_row, from_col), self.board.en_passant_target)
-            legal_moves = [
-                move for move in legal_moves
-                if not self.board.move_puts_king_in_check((from_row, from_col), move)
-            ]
+            legal_moves = self.legal_targets((from_row, from_col))
 
             if (to_row, to_col) in legal_moves:
                 result = self.board.move_piece((from_row, from_col), (to_row, to_col))
@@ -117,19 +131,13 @@ class ChessGUI:
                         self.board.board[r][c] = Bishop(self.turn)
                     elif promoted_piece == 'Knight':
                         self.board.board[r][c] = Knight(self.turn)
+                    self.board.record_promotion((r, c))
 
                 # Switch turn
                 self.turn = 'black' if self.turn == 'white' else 'white'
                 self.turn_label.config(text=f"{self.turn.capitalize()}'s Turn")
 
-                # Check for draw by repetition
-                if self.board.is_threefold_repetition():
-                    self.draw_board()
-                    tk.messagebox.showinfo("Game Over", "Draw by threefold repetition!")
-                    self.game_over = True
-                    return
-
-                # Checkmate or stalemate
+                # Checkmate or stalemate (a mate on the 100th quiet ply is still a mate)
                 if self.board.is_checkmate(self.turn):
                     self.draw_board()
                     tk.messagebox.showinfo("Game Over", f"{'White' if self.turn == 'black' else 'Black'} wins by checkmate!")
@@ -141,6 +149,14 @@ class ChessGUI:
                     self.game_over = True
                     return
 
+                # Check for draw by repetition or the fifty/seventy-five-move rule
+                draw_status = self.board.get_draw_status()
+                if draw_status:
+                    self.draw_board()
+                    tk.messagebox.showinfo("Game Over", f"Draw by {DRAW_MESSAGES[draw_status]}!")
+                    self.game_over = True
+                    return
+
         self.draw_board()
 
 
@@ -175,11 +191,7 @@ class ChessGUI:
         if self.selected:
             piece = self.board.get_piece(*self.selected)
             if piece and piece.color == self.turn:
-                legal_moves = piece.get_legal_moves(self.board.board, self.selected, self.board.en_passant_target)
-                legal_moves = [
-                    move for move in legal_moves
-                    if not self.board.move_puts_king_in_check(self.selected, move)
-                ]
+                legal_moves = self.legal_targets(self.selected)
 
                 if (row, col) in legal_moves:
                     result = self.board.move_piece(self.selected, (row, col))
@@ -196,19 +208,13 @@ class ChessGUI:
                                 self.board.board[r][c] = Bishop(self.turn)
                             elif promoted_piece == 'Knight':
                                 self.board.board[r][c] = Knight(self.turn)
+                            self.board.record_promotion((r, c))
 
                         self.selected = None
                         self.turn = 'black' if self.turn == 'white' else 'white'
                         self.turn_label.config(text=f"{self.turn.capitalize()}'s Turn")
 
-                        # Draw repetition check
-                        if self.board.is_threefold_repetition():
-                            self.draw_board()
-                            tk.messagebox.showinfo("Game Over", "Draw by threefold repetition!")
-                            self.game_over = True
-                            return
-
-                        # Game end check
+                        # Game end check, before the draw rules
                         if self.board.is_checkmate(self.turn):
                             self.draw_board()
                             tk.messagebox.showinfo("Game Over", f"{'White' if self.turn == 'black' else 'Black'} wins by checkmate!")
@@ -219,6 +225,14 @@ class ChessGUI:
                             tk.messagebox.showinfo("Game Over", "Stalemate! It's a draw.")
                             self.game_over = True
                             return
+
+                        # Draw by repetition / move-rule check
+                        draw_status = self.board.get_draw_status()
+                        if draw_status:
+                            self.draw_board()
+                            tk.messagebox.showinfo("Game Over", f"Draw by {DRAW_MESSAGES[draw_status]}!")
+                            self.game_over = True
+                            return
                     else:
                         self.selected = None
 
@@ -260,6 +274,12 @@ class ChessGUI:
         return selected['piece']
 
 
+    def legal_targets(self, square):
+        """Squares the piece on square can legally move to, checked on an immutable snapshot"""
+        position = Position.from_board(self.board)
+        return {end for _, end, _ in position.legal_moves(square)}
+
+
     def draw_board(self):
         """Render board and pieces"""
         self.canvas.delete("all")
@@ -267,6 +287,13 @@ class ChessGUI:
         king_pos = self.board.find_king(self.turn)
         in_check = self.board.is_in_check(self.turn)
 
+        # Legal targets of the selected piece, computed once rather than per square
+        legal_moves = set()
+        if self.selected:
+            piece = self.board.get_piece(*self.selected)
+            if piece and piece.color == self.turn:
+                legal_moves = self.legal_targets(self.selected)
+
         for row in range(8):
             for col in range(8):
                 x1 = col * self.cell_size
@@ -279,16 +306,8 @@ class ChessGUI:
                     fill = "#ffaaaa"  # Highlight checked king
 
                 # Highlight legal moves
-                if self.selected:
-                    piece = self.board.get_piece(*self.selected)
-                    if piece and piece.color == self.turn:
-                        legal_moves = piece.get_legal_moves(self.board.board, self.selected, self.board.en_passant_target)
-                        legal_moves = [
-                            move for move in legal_moves
-                            if not self.board.move_puts_king_in_check(self.selected, move)
-                        ]
-                        if (row, col) in legal_moves:
-                            fill = "#ccffcc"
+                if (row, col) in legal_moves:
+                    fill = "#ccffcc"
 
                 self.canvas.create_rectangle(x1, y1, x2, y2, fill=fill, outline="black")
 
@@ -305,6 +324,47 @@ class ChessGUI:
             self.highlight_square(row, col)
 
 
+    def annotate_game(self):
+        """Analyse every move in a background process pool and stream results into a window"""
+        if not self.board.move_history:
+            return
+
+        window = tk.Toplevel(self.window)
+        window.title("Game Annotation")
+        text = tk.Text(window, width=70, height=30, font=("Courier", 11))
+        text.pack(fill='both', expand=True)
+
+        # Tk is not thread-safe: the worker thread only fills a queue, polled below
+        results = queue.Queue()
+        board = copy.deepcopy(self.board)
+
+        def work():
+            try:
+                # Forking a running Tk process is unsafe; start fresh interpreters instead
+                annotate_board(board, on_move=results.put, mp_context=multiprocessing.get_context('spawn'))
+            finally:
+                results.put(None)
+
+        threading.Thread(target=work, daemon=True).start()
+        self.poll_annotations(text, results)
+
+
+    def poll_annotations(self, text, results):
+        """Move finished annotations from the worker queue into the text widget"""
+        if not text.winfo_exists():
+            return  # Window closed; the analysis finishes in the background
+        while True:
+            try:
+                annotation = results.get_nowait()
+            except queue.Empty:
+                break
+            if annotation is None:
+                text.insert('end', "Analysis complete.\n")
+                return
+            text.insert('end', format_annotation(annotation) + "\n")
+        self.window.after(100, self.poll_annotations, text, results)
+
+
     def restart_game(self):
         """Reset the game state"""
         self.board = Board()
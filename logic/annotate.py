@@ -0,0 +1,253 @@
+import copy
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from logic.board import Board
+from logic.notation import move_to_san, move_to_uci
+from logic.search import MATE_SCORE, Deadline, Search, TranspositionTable
+
+# Centipawns lost by the mover against the engine's best move
+INACCURACY, MISTAKE, BLUNDER = 50, 100, 200
+FLAG_NAGS = {'inaccuracy': '?!', 'mistake': '?', 'blunder': '??'}
+
+# Cap scores when measuring loss so mate scores don't swamp the numbers
+LOSS_CAP = 1500
+
+
+def position_key(fen):
+    # Positions that differ only in move counters are the same for analysis
+    return " ".join(fen.split()[:4])
+
+
+def analyse_position(fen, time_budget, max_depth):
+    # Worker task: search one position for at most time_budget seconds
+    board = Board.from_fen(fen)
+    searcher = Search(board, TranspositionTable(1 << 14), stop_event=Deadline(time_budget))
+    depth, score, move = searcher.iterative_deepening(max_depth)
+    white_score = score if board.current_turn() == 'white' else -score
+    return {
+        'depth': depth,
+        'nodes': searcher.nodes,
+        'score': score,  # Side to move
+        'eval': white_score,  # White's point of view
+        'best_move': move_to_uci(*move) if move else None,
+        'best_san': move_to_san(board, *move) if move else None,
+    }
+
+
+def snapshot_game(board):
+    # (fen, move, san) before every move of the game, then (fen, None, None) for the end
+    replay = copy.deepcopy(board)
+    moves = []
+    while replay.move_history:
+        entry = replay.move_history[-1]
+        promotion = entry["promotion"].symbol if entry["promotion"] else None
+        replay.undo_move()
+        moves.append((entry["start"], entry["end"], promotion))
+    moves.reverse()
+
+    snapshots = []
+    for move in moves:
+        snapshots.append((replay.to_fen(), move, move_to_san(replay, *move)))
+        replay.apply_move(*move)
+    snapshots.append((replay.to_fen(), None, None))
+    return snapshots
+
+
+def analyse_positions(fens, workers=None, time_budget=0.5, max_depth=64, mp_context=None):
+    # Fan positions out to a process pool; yield (index, analysis) as results arrive.
+    # Repeated positions (same FEN up to move counters) are searched only once.
+    # mp_context picks the start method, e.g. 'spawn' when called from a threaded GUI.
+    waiting = {}
+    for index, fen in enumerate(fens):
+        waiting.setdefault(position_key(fen), []).append(index)
+
+    with ProcessPoolExecutor(max_workers=workers, mp_context=mp_context) as pool:
+        futures = {pool.submit(analyse_position, fens[indices[0]], time_budget, max_depth): key
+                   for key, indices in waiting.items()}
+        for future in as_completed(futures):
+            analysis = future.result()
+            for index in waiting[futures[future]]:
+                yield index, analysis
+
+
+def format_eval(score):
+    # White-POV score as '+0.35', '-1.20', '#3' or '#-2'; just '#' once the side to move is mated
+    if abs(score) >= MATE_SCORE - 64:
+        moves = (MATE_SCORE - abs(score) + 1) // 2
+        if moves == 0:
+            return "#"
+        return f"#{moves}" if score > 0 else f"#-{moves}"
+    return f"{score / 100:+.2f}"
+
+
+def _clamp(score):
+    return max(-LOSS_CAP, min(LOSS_CAP, score))
+
+
+class GameAnnotator:
+    # Collects position analyses in any order and emits move annotations as soon
+    # as both the position before and after a move have been analysed
+    def __init__(self, snapshots):
+        self.snapshots = snapshots
+        self.analyses = {}
+        self.annotations = {}
+
+    def add(self, index, analysis):
+        self.analyses[index] = analysis
+        ready = []
+        for ply in (index - 1, index):
+            if 0 <= ply < len(self.snapshots) - 1 and ply not in self.annotations \
+                    and ply in self.analyses and ply + 1 in self.analyses:
+                self.annotations[ply] = self.annotate(ply)
+                ready.append(self.annotations[ply])
+        return ready
+
+    def annotate(self, ply):
+        fen, move, san = self.snapshots[ply]
+        before, after = self.analyses[ply], self.analyses[ply + 1]
+        uci = move_to_uci(*move)
+        # Mover's view: best available vs. what the played move leads to
+        loss = _clamp(before['score']) - _clamp(-after['score'])
+        if uci == before['best_move'] or loss < 0:
+            loss = 0
+        flag = None
+        if loss >= BLUNDER:
+            flag = 'blunder'
+        elif loss >= MISTAKE:
+            flag = 'mistake'
+        elif loss >= INACCURACY:
+            flag = 'inaccuracy'
+        return {
+            'ply': ply,
+            'fen': fen,
+            'move': uci,
+            'san': san,
+            'eval': after['eval'],
+            'best_move': before['best_move'],
+            'best_san': before['best_san'],
+            'best_eval': before['eval'],
+            'loss': loss,
+            'flag': flag,
+            'depth': before['depth'],
+        }
+
+    def ordered(self):
+        return [self.annotations[ply] for ply in sorted(self.annotations)]
+
+
+def annotate_board(board, workers=None, time_budget=0.5, max_depth=64, on_move=None, mp_context=None):
+    # Annotate every move played on board; on_move(annotation) is called as each one is ready
+    snapshots = snapshot_game(board)
+    annotator = GameAnnotator(snapshots)
+    fens = [fen for fen, _, _ in snapshots]
+    for index, analysis in analyse_positions(fens, workers, time_budget, max_depth, mp_context):
+        for annotation in annotator.add(index, analysis):
+            if on_move is not None:
+                on_move(annotation)
+    return annotator.ordered()
+
+
+def game_result(board):
+    # PGN result tag for the final position
+    color = board.current_turn()
+    if board.is_checkmate(color):
+        return '0-1' if color == 'white' else '1-0'
+    if board.is_stalemate(color) or board.get_draw_status():
+        return '1/2-1/2'
+    return '*'
+
+
+def format_annotation(annotation):
+    # One-line summary, e.g. '5. bxa8=N?? -8.03 (blunder, best bxa8=Q +0.00)'
+    fen = annotation['fen'].split()
+    number = f"{fen[5]}." if fen[1] == 'w' else f"{fen[5]}..."
+    line = f"{number} {annotation['san']}{FLAG_NAGS.get(annotation['flag'], '')} {format_eval(annotation['eval'])}"
+    if annotation['flag']:
+        line += f" ({annotation['flag']}, best {annotation['best_san']} {format_eval(annotation['best_eval'])})"
+    return line
+
+
+def to_json(annotations, result='*'):
+    return json.dumps({'result': result, 'moves': annotations}, indent=2)
+
+
+def to_pgn(annotations, result='*', headers=None):
+    tags = {'Event': '?', 'Site': '?', 'Date': '????.??.??', 'Round': '?',
+            'White': '?', 'Black': '?', 'Result': result}
+    tags.update(headers or {})
+    lines = [f'[{name} "{value}"]' for name, value in tags.items()]
+
+    tokens = []
+    for annotation in annotations:
+        fen = annotation['fen'].split()
+        white_to_move = fen[1] == 'w'
+        move_number = fen[5]
+        if white_to_move:
+            tokens.append(f"{move_number}.")
+        elif annotation['ply'] == 0:
+            tokens.append(f"{move_number}...")
+        tokens.append(annotation['san'] + FLAG_NAGS.get(annotation['flag'], ''))
+        comment = format_eval(annotation['eval'])
+        if annotation['flag']:
+            comment += f"; {annotation['flag']}, best {annotation['best_san']} {format_eval(annotation['best_eval'])}"
+        tokens.append("{" + comment + "}")
+    tokens.append(result)
+
+    # Wrap movetext at 80 columns like most PGN writers
+    text, line = [], ""
+    for token in tokens:
+        if line and len(line) + 1 + len(token) > 80:
+            text.append(line)
+            line = token
+        else:
+            line = f"{line} {token}" if line else token
+    text.append(line)
+    return "\n".join(lines) + "\n\n" + "\n".join(text) + "\n"
+
+
+if __name__ == '__main__':
+    import argparse
+    import sys
+
+    from logic.export import read_games
+    from logic.game import replay
+
+    parser = argparse.ArgumentParser(description="Annotate games with evaluations and blunder flags")
+    parser.add_argument("games", help="game file, one game per line: 'e2e4 e7e5 ... 1-0'")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--time", type=float, default=0.5, help="seconds per position")
+    parser.add_argument("--depth", type=int, default=64, help="maximum search depth")
+    parser.add_argument("--pgn", help="write annotated PGN here")
+    parser.add_argument("--json", help="write annotations as JSON here")
+    args = parser.parse_args()
+
+    pgn_games, json_games = [], []
+    start = time.perf_counter()
+    positions = 0
+    for number, (moves, _) in enumerate(read_games(args.games), 1):
+        # Replay through the rules engine so illegal moves can't hand the turn to the wrong side
+        _, illegal, _, game = replay(moves)
+        if illegal is not None:
+            print(f"skipping game {number}: illegal move {moves[illegal]!r} at ply {illegal + 1}", file=sys.stderr)
+            continue
+        board = game.board
+        annotations = annotate_board(board, args.workers, args.time, args.depth)
+        result = game_result(board)
+        positions += len(annotations) + 1
+        pgn_games.append(to_pgn(annotations, result))
+        json_games.append({'result': result, 'moves': annotations})
+    elapsed = time.perf_counter() - start
+
+    if args.pgn:
+        with open(args.pgn, 'w') as f:
+            f.write("\n".join(pgn_games))
+    else:
+        print("\n".join(pgn_games))
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(json_games, f, indent=2)
+    print(f"{positions} positions in {elapsed:.2f}s ({positions / elapsed:.1f} positions/s, "
+          f"{args.workers} workers)")
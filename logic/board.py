@@ -1,5 +1,7 @@
 from logic.piece import Pawn, Rook, Knight, Bishop, Queen, King
-from collections import defaultdict
+
+# Pieces a pawn may promote to, keyed by symbol
+PROMOTION_PIECES = {'Q': Queen, 'R': Rook, 'B': Bishop, 'N': Knight}
 
 
 class Board:
@@ -7,7 +9,10 @@ class Board:
         self.board = [[None for _ in range(8)] for _ in range(8)]  # 8x8 chess board
         self.move_history = []  # Stores history of moves
         self.en_passant_target = None  # Target square for en passant
-        self.position_counts = defaultdict(int)  # Track repetition of positions
+        self.ply_offset = 0  # Plies played before the starting position (set from FEN)
+        self.halfmove_clock = 0  # Plies since the last capture or pawn move
+        self.position_history = []  # Board hashes since the last capture or pawn move
+        self.unrestored_positions = 0  # Earlier window positions dropped by undo_move, rebuilt on demand
         self.setup_board()  # Set up pieces
         self.update_repetition_counter()  # Count the initial board position
 
@@ -20,11 +25,60 @@ class Board:
                     board_state.append(f"{piece.symbol}{piece.color[0]}")
                 else:
                     board_state.append(".")
-        turn = 'w' if len(self.move_history) % 2 == 0 else 'b'  # Who's turn
+        turn = self.current_turn()[0]  # Who's turn
         castling = self.get_castling_rights()
         ep = str(self.en_passant_target) if self.en_passant_target else "-"
         return "".join(board_state) + turn + castling + ep
 
+    def current_turn(self):
+        # Side to move, derived from the number of moves played
+        return 'white' if (len(self.move_history) + self.ply_offset) % 2 == 0 else 'black'
+
+    @classmethod
+    def from_fen(cls, fen):
+        # Build a board from a FEN string (placement, turn, castling, en passant)
+        fields = fen.split()
+        placement = fields[0]
+        turn = fields[1] if len(fields) > 1 else 'w'
+        castling = fields[2] if len(fields) > 2 else '-'
+        ep = fields[3] if len(fields) > 3 else '-'
+
+        board = cls()
+        board.board = [[None for _ in range(8)] for _ in range(8)]
+        piece_classes = {'P': Pawn, 'R': Rook, 'N': Knight, 'B': Bishop, 'Q': Queen, 'K': King}
+        for row, rank in enumerate(placement.split('/')):
+            col = 0
+            for ch in rank:
+                if ch.isdigit():
+                    col += int(ch)
+                    continue
+                color = 'white' if ch.isupper() else 'black'
+                piece = piece_classes[ch.upper()](color)
+                piece.has_moved = True  # Castling rights restored below
+                board.board[row][col] = piece
+                col += 1
+
+        # Kings and rooks keep has_moved = False only while castling is allowed
+        for color, row, ks, qs in (('white', 7, 'K', 'Q'), ('black', 0, 'k', 'q')):
+            king = board.board[row][4]
+            if isinstance(king, King) and king.color == color:
+                king.has_moved = ks not in castling and qs not in castling
+            for col, flag in ((7, ks), (0, qs)):
+                rook = board.board[row][col]
+                if isinstance(rook, Rook) and rook.color == color:
+                    rook.has_moved = flag not in castling
+
+        if ep != '-':
+            board.en_passant_target = (8 - int(ep[1]), ord(ep[0]) - ord('a'))
+        fullmove = int(fields[5]) if len(fields) > 5 else 1
+        board.ply_offset = 2 * (fullmove - 1) + (0 if turn == 'w' else 1)
+
+        board.halfmove_clock = int(fields[4]) if len(fields) > 4 else 0
+        board.position_history = []
+        board.unrestored_positions = 0
+        board.update_repetition_counter()
+        return board
+
     def get_position_key(self):
         # Simpler version of board hash used for repetition detection
         key = ""
@@ -39,14 +93,49 @@ class Board:
         return key
 
     def update_repetition_counter(self):
-        # Update the position counter to track repetitions
-        board_hash = self.get_board_hash()
-        self.position_counts[board_hash] += 1
+        # Push the current position onto the repetition stack (one entry per ply)
+        self.position_history.append(self.get_board_hash())
 
     def is_threefold_repetition(self):
-        # Check if current position has occurred 3 times
-        board_hash = self.get_board_hash()
-        return self.position_counts[board_hash] >= 3
+        # Check if current position has occurred 3 times. Only positions since the
+        # last capture or pawn move can repeat, and only every other ply (same side to move)
+        if self.unrestored_positions:
+            self.restore_positions()
+        if not self.position_history:
+            return False
+        board_hash = self.position_history[-1]
+        return self.position_history[-1::-2].count(board_hash) >= 3
+
+    def restore_positions(self):
+        # Undoing a capture or pawn move only remembers how long the earlier window was.
+        # Rebuild its hashes by taking back the reversible moves in it and replaying them.
+        count = self.unrestored_positions + len(self.position_history) - 1
+        moves = [(move["start"], move["end"]) for move in self.move_history[len(self.move_history) - count:]] \
+            if count > 0 else []
+        for _ in moves:
+            self.undo_move()
+        self.position_history = [self.get_board_hash()]
+        self.unrestored_positions = 0
+        for start, end in moves:
+            self.move_piece(start, end)
+
+    def is_fifty_move_rule(self):
+        # 50 moves by each side without a capture or pawn move (draw may be claimed)
+        return self.halfmove_clock >= 100
+
+    def is_seventy_five_move_rule(self):
+        # 75 moves by each side without a capture or pawn move (automatic draw)
+        return self.halfmove_clock >= 150
+
+    def get_draw_status(self):
+        # Name of the draw rule that applies to the current position, or None
+        if self.is_threefold_repetition():
+            return 'threefold'
+        if self.is_seventy_five_move_rule():
+            return 'seventy-five-move'
+        if self.is_fifty_move_rule():
+            return 'fifty-move'
+        return None
 
     def get_castling_rights(self):
         # Return castling rights in FEN style (e.g., KQkq)
@@ -112,11 +201,66 @@ class Board:
         return False
 
     def move_puts_king_in_check(self, from_pos, to_pos):
-        # Simulate move and check if it puts own king in check
-        import copy
-        temp_board = copy.deepcopy(self)
-        temp_board.move_piece(from_pos, to_pos)
-        return temp_board.is_in_check(self.get_piece(*from_pos).color)
+        # Simulate move and check if it puts own king in check, then take it back
+        color = self.get_piece(*from_pos).color
+        moved = self.move_piece(from_pos, to_pos)
+        in_check = self.is_in_check(color)
+        if moved:
+            self.undo_move()
+        return in_check
+
+    def legal_moves(self, color=None):
+        # All (start, end) moves for color that don't leave its own king in check
+        color = color or self.current_turn()
+        moves = []
+        for row in range(8):
+            for col in range(8):
+                piece = self.board[row][col]
+                if piece and piece.color == color:
+                    for move in piece.get_legal_moves(self.board, (row, col), self.en_passant_target):
+                        if not self.move_puts_king_in_check((row, col), move):
+                            moves.append(((row, col), move))
+        return moves
+
+    def apply_move(self, start_pos, end_pos, promotion='Q'):
+        # Same as move_piece, but completes pawn promotion instead of asking the caller
+        result = self.move_piece(start_pos, end_pos)
+        if isinstance(result, tuple) and result[0] == 'promote':
+            r, c = result[1]
+            self.board[r][c] = PROMOTION_PIECES[(promotion or 'Q').upper()](self.board[r][c].color)
+            self.record_promotion((r, c))
+            return True
+        return result
+
+    def record_promotion(self, pos):
+        # Call once the promoted pawn on pos has been replaced (the GUI asks the user
+        # which piece): notes it in the move history and counts the new position
+        r, c = pos
+        promoted = self.board[r][c]
+        promoted.has_moved = True  # Never a castling rook
+        self.move_history[-1]["promotion"] = promoted
+        self.update_repetition_counter()
+
+    def to_fen(self):
+        # FEN string of the current position (inverse of from_fen)
+        ranks = []
+        for row in self.board:
+            rank, empty = "", 0
+            for piece in row:
+                if piece is None:
+                    empty += 1
+                    continue
+                if empty:
+                    rank += str(empty)
+                    empty = 0
+                rank += str(piece)
+            ranks.append(rank + (str(empty) if empty else ""))
+        ep = "-"
+        if self.en_passant_target:
+            ep = f"{chr(ord('a') + self.en_passant_target[1])}{8 - self.en_passant_target[0]}"
+        fullmove = 1 + (len(self.move_history) + self.ply_offset) // 2
+        return (f"{'/'.join(ranks)} {self.current_turn()[0]} {self.get_castling_rights()} "
+                f"{ep} {self.halfmove_clock} {fullmove}")
 
     def find_king(self, color):
         # Find the king's position for the given color
@@ -157,9 +301,11 @@ class Board:
                 # ✅ En passant capture handling
                 if isinstance(piece, Pawn) and self.en_passant_target == (er, ec) and sc != ec and self.board[er][ec] is None:
                     captured_piece = self.board[sr][ec]  # Captured pawn
+                    captured_pos = (sr, ec)
                     self.board[sr][ec] = None
                 else:
                     captured_piece = self.board[er][ec]
+                    captured_pos = (er, ec)
 
                 # ✅ Move the piece
                 self.board[er][ec] = piece
@@ -171,9 +317,25 @@ class Board:
                     "start": (sr, sc),
                     "end": (er, ec),
                     "captured": captured_piece,
-                    "was_first_move": piece.has_moved if hasattr(piece, "has_moved") else None
+                    "captured_pos": captured_pos,
+                    "was_first_move": piece.has_moved if hasattr(piece, "has_moved") else None,
+                    "prev_en_passant": self.en_passant_target,
+                    "rook_move": None,  # (from, to) when castling
+                    "promotion": None,  # Piece the pawn became, set by apply_move
+                    "prev_halfmove_clock": self.halfmove_clock,
+                    "prev_window": None,  # Length of the repetition window an irreversible move dropped
                 })
 
+                # ✅ Captures and pawn moves are irreversible: earlier positions can never
+                # repeat, so start a fresh repetition window and reset the fifty-move clock
+                if captured_piece is not None or isinstance(piece, Pawn):
+                    self.move_history[-1]["prev_window"] = len(self.position_history) + self.unrestored_positions
+                    self.position_history = []
+                    self.unrestored_positions = 0
+                    self.halfmove_clock = 0
+                else:
+                    self.halfmove_clock += 1
+
                 # ✅ Mark the piece as moved (used for castling logic)
                 if hasattr(piece, "has_moved"):
                     piece.has_moved = True
@@ -194,12 +356,14 @@ class Board:
                         rook = self.board[sr][7]
                         self.board[sr][5] = rook
                         self.board[sr][7] = None
+                        self.move_history[-1]["rook_move"] = ((sr, 7), (sr, 5))
                         if hasattr(rook, "has_moved"):
                             rook.has_moved = True
                     elif ec == 2:  # Queenside
                         rook = self.board[sr][0]
                         self.board[sr][3] = rook
                         self.board[sr][0] = None
+                        self.move_history[-1]["rook_move"] = ((sr, 0), (sr, 3))
                         if hasattr(rook, "has_moved"):
                             rook.has_moved = True
 
@@ -210,6 +374,42 @@ class Board:
 
         return False
 
+    def undo_move(self):
+        # Take back the last move made with move_piece/apply_move
+        if not self.move_history:
+            return None
+
+        move = self.move_history.pop()
+        piece = move["piece"]
+        (sr, sc), (er, ec) = move["start"], move["end"]
+
+        self.board[er][ec] = None
+        self.board[sr][sc] = piece  # The pawn itself if it was promoted
+        if move["captured"] is not None:
+            cr, cc = move["captured_pos"]
+            self.board[cr][cc] = move["captured"]
+        if move["was_first_move"] is not None:
+            piece.has_moved = move["was_first_move"]
+
+        if move["rook_move"]:
+            (rr, rc), (tr, tc) = move["rook_move"]
+            rook = self.board[tr][tc]
+            self.board[rr][rc] = rook
+            self.board[tr][tc] = None
+            rook.has_moved = False  # Castling requires an unmoved rook
+
+        self.en_passant_target = move["prev_en_passant"]
+        self.halfmove_clock = move["prev_halfmove_clock"]
+        if move["prev_window"] is not None:
+            # Only the window length was kept; the hashes are rebuilt if a repetition check needs them
+            self.position_history = []
+            self.unrestored_positions = move["prev_window"]
+        elif self.position_history:
+            self.position_history.pop()
+        elif self.unrestored_positions:
+            self.unrestored_positions -= 1
+        return move
+
     def display(self):
         # Print the board to console
         print("   a b c d e f g h")
@@ -0,0 +1,63 @@
+import numpy as np
+
+from logic.board import Board
+
+# Square index = row * 8 + col, row 0 being rank 8 (same layout as Board.board)
+# Codes: 0 empty, 1..6 white P N B R Q K, -1..-6 black p n b r q k
+PIECE_CODES = {'P': 1, 'N': 2, 'B': 3, 'R': 4, 'Q': 5, 'K': 6}
+FEN_CODES = {**PIECE_CODES, **{symbol.lower(): -code for symbol, code in PIECE_CODES.items()}}
+
+# Plane order for the (N, 12, 8, 8) layout: white P..K then black p..k
+PLANE_CODES = [1, 2, 3, 4, 5, 6, -1, -2, -3, -4, -5, -6]
+
+
+def encode_board(board, out=None):
+    # Encode a Board into a flat (64,) int8 array of piece codes
+    values = [0] * 64
+    for row in range(8):
+        for col in range(8):
+            piece = board.board[row][col]
+            if piece:
+                code = PIECE_CODES[piece.symbol]
+                values[row * 8 + col] = code if piece.color == 'white' else -code
+    if out is None:
+        return np.array(values, dtype=np.int8)
+    out[:] = values
+    return out
+
+
+def encode_fen(fen, out=None):
+    # Encode the placement field of a FEN string without building a Board
+    values = []
+    for ch in fen.split()[0]:
+        if ch.isdigit():
+            values.extend([0] * int(ch))
+        elif ch != '/':
+            values.append(FEN_CODES[ch])
+    if out is None:
+        return np.array(values, dtype=np.int8)
+    out[:] = values
+    return out
+
+
+def encode_positions(positions):
+    # Encode a sequence of Boards and/or FEN strings into an (N, 64) int8 array
+    codes = np.zeros((len(positions), 64), dtype=np.int8)
+    for i, position in enumerate(positions):
+        if isinstance(position, Board):
+            encode_board(position, codes[i])
+        else:
+            encode_fen(position, codes[i])
+    return codes
+
+
+def to_planes(codes):
+    # Expand (N, 64) piece codes into (N, 12, 8, 8) one-hot int8 planes
+    codes = np.asarray(codes, dtype=np.int8).reshape(-1, 64)
+    planes = codes[:, None, :] == np.array(PLANE_CODES, dtype=np.int8)[None, :, None]
+    return planes.astype(np.int8).reshape(-1, 12, 8, 8)
+
+
+def encode_planes(positions):
+    # Encode Boards and/or FEN strings straight into (N, 12, 8, 8) planes
+    return to_planes(encode_positions(positions))
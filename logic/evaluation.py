@@ -0,0 +1,290 @@
+import numpy as np
+
+from logic.encoding import PIECE_CODES, encode_positions
+from logic.piece import BISHOP_DIRECTIONS, KNIGHT_DELTAS, ROOK_DIRECTIONS
+
+# Scores are in centipawns from white's point of view
+PIECE_VALUES = {'P': 100, 'N': 320, 'B': 330, 'R': 500, 'Q': 900, 'K': 0}
+
+# Piece-square tables from white's side, row 0 = rank 8 (mirrored for black)
+PIECE_SQUARE_TABLES = {
+    'P': [
+        [0, 0, 0, 0, 0, 0, 0, 0],
+        [50, 50, 50, 50, 50, 50, 50, 50],
+        [10, 10, 20, 30, 30, 20, 10, 10],
+        [5, 5, 10, 25, 25, 10, 5, 5],
+        [0, 0, 0, 20, 20, 0, 0, 0],
+        [5, -5, -10, 0, 0, -10, -5, 5],
+        [5, 10, 10, -20, -20, 10, 10, 5],
+        [0, 0, 0, 0, 0, 0, 0, 0],
+    ],
+    'N': [
+        [-50, -40, -30, -30, -30, -30, -40, -50],
+        [-40, -20, 0, 0, 0, 0, -20, -40],
+        [-30, 0, 10, 15, 15, 10, 0, -30],
+        [-30, 5, 15, 20, 20, 15, 5, -30],
+        [-30, 0, 15, 20, 20, 15, 0, -30],
+        [-30, 5, 10, 15, 15, 10, 5, -30],
+        [-40, -20, 0, 5, 5, 0, -20, -40],
+        [-50, -40, -30, -30, -30, -30, -40, -50],
+    ],
+    'B': [
+        [-20, -10, -10, -10, -10, -10, -10, -20],
+        [-10, 0, 0, 0, 0, 0, 0, -10],
+        [-10, 0, 5, 10, 10, 5, 0, -10],
+        [-10, 5, 5, 10, 10, 5, 5, -10],
+        [-10, 0, 10, 10, 10, 10, 0, -10],
+        [-10, 10, 10, 10, 10, 10, 10, -10],
+        [-10, 5, 0, 0, 0, 0, 5, -10],
+        [-20, -10, -10, -10, -10, -10, -10, -20],
+    ],
+    'R': [
+        [0, 0, 0, 0, 0, 0, 0, 0],
+        [5, 10, 10, 10, 10, 10, 10, 5],
+        [-5, 0, 0, 0, 0, 0, 0, -5],
+        [-5, 0, 0, 0, 0, 0, 0, -5],
+        [-5, 0, 0, 0, 0, 0, 0, -5],
+        [-5, 0, 0, 0, 0, 0, 0, -5],
+        [-5, 0, 0, 0, 0, 0, 0, -5],
+        [0, 0, 0, 5, 5, 0, 0, 0],
+    ],
+    'Q': [
+        [-20, -10, -10, -5, -5, -10, -10, -20],
+        [-10, 0, 0, 0, 0, 0, 0, -10],
+        [-10, 0, 5, 5, 5, 5, 0, -10],
+        [-5, 0, 5, 5, 5, 5, 0, -5],
+        [0, 0, 5, 5, 5, 5, 0, -5],
+        [-10, 5, 5, 5, 5, 5, 0, -10],
+        [-10, 0, 5, 0, 0, 0, 0, -10],
+        [-20, -10, -10, -5, -5, -10, -10, -20],
+    ],
+    'K': [
+        [-30, -40, -40, -50, -50, -40, -40, -30],
+        [-30, -40, -40, -50, -50, -40, -40, -30],
+        [-30, -40, -40, -50, -50, -40, -40, -30],
+        [-30, -40, -40, -50, -50, -40, -40, -30],
+        [-20, -30, -30, -40, -40, -30, -30, -20],
+        [-10, -20, -20, -20, -20, -20, -20, -10],
+        [20, 20, 0, 0, 0, 0, 20, 20],
+        [20, 30, 10, 0, 0, 10, 30, 20],
+    ],
+}
+
+# Bonus per pseudo-legal target square (empty or enemy) of each piece type
+MOBILITY_WEIGHTS = {'N': 4, 'B': 5, 'R': 2, 'Q': 1}
+
+# Pawn structure terms, applied per pawn
+DOUBLED_PAWN_PENALTY = 15
+ISOLATED_PAWN_PENALTY = 15
+PASSED_PAWN_BONUS = 20
+
+SLIDER_DIRECTIONS = {
+    'B': BISHOP_DIRECTIONS,
+    'R': ROOK_DIRECTIONS,
+    'Q': ROOK_DIRECTIONS + BISHOP_DIRECTIONS,
+}
+
+
+# ---------------------------------------------------------------------------
+# Per-board evaluation (plain Python over Board.board)
+# ---------------------------------------------------------------------------
+
+def _mobility(grid, row, col, symbol, color):
+    # Count squares a knight/slider could move to, ignoring pins and checks
+    count = 0
+    if symbol == 'N':
+        for dr, dc in KNIGHT_DELTAS:
+            r, c = row + dr, col + dc
+            if 0 <= r < 8 and 0 <= c < 8:
+                target = grid[r][c]
+                if target is None or target.color != color:
+                    count += 1
+        return count
+
+    for dr, dc in SLIDER_DIRECTIONS[symbol]:
+        r, c = row + dr, col + dc
+        while 0 <= r < 8 and 0 <= c < 8:
+            target = grid[r][c]
+            if target is None:
+                count += 1
+            else:
+                if target.color != color:
+                    count += 1
+                break
+            r += dr
+            c += dc
+    return count
+
+
+def evaluate(board):
+    # Static evaluation of a single Board, one square at a time
+    grid = board.board
+    score = 0
+    pawn_files = {'white': [0] * 8, 'black': [0] * 8}
+    pawns = {'white': [], 'black': []}
+
+    for row in range(8):
+        for col in range(8):
+            piece = grid[row][col]
+            if piece is None:
+                continue
+            symbol = piece.symbol
+            sign = 1 if piece.color == 'white' else -1
+            table_row = row if piece.color == 'white' else 7 - row
+            value = PIECE_VALUES[symbol] + PIECE_SQUARE_TABLES[symbol][table_row][col]
+            if symbol in MOBILITY_WEIGHTS:
+                value += MOBILITY_WEIGHTS[symbol] * _mobility(grid, row, col, symbol, piece.color)
+            elif symbol == 'P':
+                pawn_files[piece.color][col] += 1
+                pawns[piece.color].append((row, col))
+            score += sign * value
+
+    for color, sign in (('white', 1), ('black', -1)):
+        files = pawn_files[color]
+        enemy = 'black' if color == 'white' else 'white'
+        for count in files:
+            if count > 1:
+                score -= sign * DOUBLED_PAWN_PENALTY * (count - 1)
+        for row, col in pawns[color]:
+            neighbours = (files[col - 1] if col > 0 else 0) + (files[col + 1] if col < 7 else 0)
+            if neighbours == 0:
+                score -= sign * ISOLATED_PAWN_PENALTY
+            # Passed: no enemy pawn ahead on this or an adjacent file
+            passed = True
+            for r, c in pawns[enemy]:
+                ahead = r < row if color == 'white' else r > row
+                if ahead and abs(c - col) <= 1:
+                    passed = False
+                    break
+            if passed:
+                score += sign * PASSED_PAWN_BONUS
+    return score
+
+
+# ---------------------------------------------------------------------------
+# Vectorized evaluation over an (N, 64) batch of piece codes
+# ---------------------------------------------------------------------------
+
+# Off-board sentinel appended as square 64; never empty, never an enemy
+OFF_BOARD = 127
+
+
+def _target_tables():
+    # Knight targets (64, 8) and slider rays (64, 8 directions, 8 steps),
+    # padded with OFF_BOARD so every gather has a fixed shape
+    knights = np.full((64, 8), 64, dtype=np.intp)
+    rays = np.full((64, 8, 8), 64, dtype=np.intp)
+    for square in range(64):
+        row, col = divmod(square, 8)
+        for i, (dr, dc) in enumerate(KNIGHT_DELTAS):
+            r, c = row + dr, col + dc
+            if 0 <= r < 8 and 0 <= c < 8:
+                knights[square, i] = r * 8 + c
+        for i, (dr, dc) in enumerate(SLIDER_DIRECTIONS['Q']):
+            r, c, step = row + dr, col + dc, 0
+            while 0 <= r < 8 and 0 <= c < 8:
+                rays[square, i, step] = r * 8 + c
+                r, c, step = r + dr, c + dc, step + 1
+    return knights, rays
+
+
+KNIGHT_TABLE, RAY_TABLE = _target_tables()
+
+# Which of the 8 queen directions each slider uses (rook dirs first, then bishop)
+DIRECTION_MASKS = np.zeros((7, 8), dtype=bool)
+DIRECTION_MASKS[PIECE_CODES['R'], :4] = True
+DIRECTION_MASKS[PIECE_CODES['B'], 4:] = True
+DIRECTION_MASKS[PIECE_CODES['Q'], :] = True
+
+# Mobility weight by absolute piece code
+MOBILITY_BY_CODE = np.zeros(7, dtype=np.int32)
+MOBILITY_BY_CODE[[PIECE_CODES[symbol] for symbol in MOBILITY_WEIGHTS]] = list(MOBILITY_WEIGHTS.values())
+
+
+def _material_table():
+    # (13, 64) lookup indexed by code + 6: value + piece-square bonus, signed
+    table = np.zeros((13, 64), dtype=np.int32)
+    for symbol, code in PIECE_CODES.items():
+        pst = np.array(PIECE_SQUARE_TABLES[symbol], dtype=np.int32)
+        table[6 + code] = (PIECE_VALUES[symbol] + pst).ravel()
+        table[6 - code] = -(PIECE_VALUES[symbol] + pst[::-1]).ravel()
+    return table
+
+
+MATERIAL_TABLE = _material_table()
+
+
+def _batch_mobility(codes):
+    # Signed, weighted mobility per position, gathered per piece instead of per square
+    n = codes.shape[0]
+    padded = np.concatenate([codes, np.full((n, 1), OFF_BOARD, dtype=np.int8)], axis=1)
+    kinds = np.abs(codes)
+
+    pos, square = np.nonzero(kinds == PIECE_CODES['N'])
+    sign = np.sign(codes[pos, square])
+    targets = padded.ravel()[pos[:, None] * 65 + KNIGHT_TABLE[square]]
+    open_targets = (targets != OFF_BOARD) & (targets * sign[:, None] <= 0)
+    score = np.bincount(pos, MOBILITY_BY_CODE[PIECE_CODES['N']] * sign * open_targets.sum(axis=1),
+                        minlength=n)
+
+    pos, square = np.nonzero((kinds >= PIECE_CODES['B']) & (kinds <= PIECE_CODES['Q']))
+    piece = codes[pos, square]
+    sign = np.sign(piece)
+    rays = padded.ravel()[pos[:, None, None] * 65 + RAY_TABLE[square]]
+    run = np.argmin(rays == 0, axis=2)  # empty squares before the first blocker
+    blocker = np.take_along_axis(rays, run[:, :, None], axis=2)[:, :, 0]
+    capture = (blocker != OFF_BOARD) & (blocker * sign[:, None] < 0)
+    moves = ((run + capture) * DIRECTION_MASKS[np.abs(piece)]).sum(axis=1)
+    score += np.bincount(pos, MOBILITY_BY_CODE[np.abs(piece)] * sign * moves, minlength=n)
+    return score.astype(np.int32)
+
+
+def _batch_pawn_structure(own_pawns, enemy_pawns, forward):
+    # Doubled, isolated and passed pawn terms for one side (positive = good)
+    files = own_pawns.sum(axis=1)  # (N, 8) pawns per file
+    doubled = np.maximum(files - 1, 0).sum(axis=1)
+
+    occupied = files > 0
+    neighbours = np.zeros_like(occupied)
+    neighbours[:, 1:] |= occupied[:, :-1]
+    neighbours[:, :-1] |= occupied[:, 1:]
+    isolated = (files * ~neighbours).sum(axis=1)
+
+    # Enemy pawns strictly ahead of each square, per file, then spread to adjacent files
+    if forward == -1:  # white moves towards row 0
+        seen = np.logical_or.accumulate(enemy_pawns, axis=1)
+        ahead = np.zeros_like(seen)
+        ahead[:, 1:] = seen[:, :-1]
+    else:
+        seen = np.logical_or.accumulate(enemy_pawns[:, ::-1], axis=1)[:, ::-1]
+        ahead = np.zeros_like(seen)
+        ahead[:, :-1] = seen[:, 1:]
+    blocked = ahead.copy()
+    blocked[:, :, 1:] |= ahead[:, :, :-1]
+    blocked[:, :, :-1] |= ahead[:, :, 1:]
+    passed = (own_pawns & ~blocked).sum(axis=(1, 2))
+
+    return (PASSED_PAWN_BONUS * passed
+            - DOUBLED_PAWN_PENALTY * doubled
+            - ISOLATED_PAWN_PENALTY * isolated)
+
+
+def evaluate_batch(codes):
+    # Static evaluation of an (N, 64) int8 batch of piece codes, see logic.encoding
+    codes = np.asarray(codes, dtype=np.int8).reshape(-1, 64)
+    scores = MATERIAL_TABLE[codes.astype(np.intp) + 6, np.arange(64)].sum(axis=1)
+
+    scores += _batch_mobility(codes)
+
+    grid = codes.reshape(-1, 8, 8)
+
+    white_pawns = grid == PIECE_CODES['P']
+    black_pawns = grid == -PIECE_CODES['P']
+    scores += _batch_pawn_structure(white_pawns, black_pawns, -1)
+    scores -= _batch_pawn_structure(black_pawns, white_pawns, 1)
+    return scores
+
+
+def evaluate_positions(positions):
+    # Encode Boards and/or FEN strings and evaluate them in one batch
+    return evaluate_batch(encode_positions(positions))
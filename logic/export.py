@@ -0,0 +1,208 @@
+import json
+import os
+
+import numpy as np
+from numpy.lib.format import open_memmap
+
+from logic.board import Board
+from logic.encoding import encode_board, to_planes
+from logic.notation import parse_game_line, parse_move
+from logic.position import Position
+
+# Each shard is a set of .npy files with the same number of rows:
+#   boards   (S, 12, 8, 8) int8   one-hot piece planes, see logic.encoding
+#   moves    (S, 64, 64)   bool   legal-move mask, [from_square, to_square]
+#   turns    (S,)          int8   1 = white to move, -1 = black to move
+#   results  (S,)          int8   game result from white's side (1, 0, -1)
+# Only full shards are committed to the manifest; the last one may be shorter.
+MANIFEST_NAME = "manifest.json"
+SHARD_FIELDS = {
+    'boards': ((12, 8, 8), np.int8),
+    'moves': ((64, 64), np.bool_),
+    'turns': ((), np.int8),
+    'results': ((), np.int8),
+}
+
+
+def read_games(path):
+    # Lazily yield (moves, result) per line of a game file: 'e2e4 e7e5 ... 1-0'
+    with open(path) as f:
+        for line in f:
+            if line.strip() and not line.startswith('#'):
+                yield parse_game_line(line)
+
+
+def iter_positions(moves, result):
+    # Walk a game ply by ply, yielding (board, result) before each move and at the end.
+    # The same Board is mutated in place, so consume each position before advancing.
+    board = Board()
+    for ply, move_str in enumerate(moves):
+        yield board, result
+        start, end, promotion = parse_move(move_str)
+        if (start, end) not in board.legal_moves():
+            raise ValueError(f"Illegal move {move_str!r} at ply {ply}")
+        board.apply_move(start, end, promotion)
+    yield board, result
+
+
+def first_illegal_ply(moves):
+    # Index of the first unparseable or illegal move, or None. Checked on a Position
+    # up front so a bad game is rejected before any of its positions are written.
+    position = Position.from_board(Board())
+    for ply, move_str in enumerate(moves):
+        try:
+            start, end, promotion = parse_move(move_str)
+        except ValueError:
+            return ply
+        legal = position.legal_moves()
+        move = (start, end, promotion)
+        if promotion is None and (start, end, 'Q') in legal:
+            move = (start, end, 'Q')  # Promotion defaults to a queen, as in Board.apply_move
+        if move not in legal:
+            return ply
+        position = position.apply(move)
+    return None
+
+
+def shard_path(directory, index, field):
+    return os.path.join(directory, f"shard_{index:05d}_{field}.npy")
+
+
+def load_manifest(directory):
+    path = os.path.join(directory, MANIFEST_NAME)
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def load_shard(directory, index, mmap_mode='r'):
+    # Return the committed rows of one shard as memory-mapped arrays
+    manifest = load_manifest(directory)
+    count = manifest['shards'][index]['positions']
+    return {field: np.load(shard_path(directory, index, field), mmap_mode=mmap_mode)[:count]
+            for field in SHARD_FIELDS}
+
+
+class ShardExporter:
+    def __init__(self, directory, shard_size=4096):
+        self.directory = directory
+        self.shard_size = shard_size
+        self.shard = None  # Open memmaps of the shard being filled
+        self.row = 0
+        os.makedirs(directory, exist_ok=True)
+
+        manifest = load_manifest(directory)
+        if manifest is None:
+            manifest = {
+                'shard_size': shard_size,
+                'fields': {name: [list(shape), np.dtype(dtype).name]
+                           for name, (shape, dtype) in SHARD_FIELDS.items()},
+                'shards': [],
+                'games_done': 0,  # Games fully stored in committed shards
+                'next_ply': 0,    # Positions of the next game already committed
+                'skipped': [],    # [game index, ply, move] of games left out for an illegal move
+                'complete': False,
+            }
+        elif manifest['shard_size'] != shard_size:
+            raise ValueError("shard_size differs from the existing manifest")
+        manifest.setdefault('skipped', [])
+        self.manifest = manifest
+
+    def write_manifest(self):
+        # Write to a temp file first so an interruption never leaves a torn manifest
+        path = os.path.join(self.directory, MANIFEST_NAME)
+        with open(path + '.tmp', 'w') as f:
+            json.dump(self.manifest, f, indent=2)
+        os.replace(path + '.tmp', path)
+
+    def open_shard(self):
+        index = len(self.manifest['shards'])
+        self.shard = {
+            field: open_memmap(shard_path(self.directory, index, field), mode='w+',
+                               dtype=dtype, shape=(self.shard_size,) + shape)
+            for field, (shape, dtype) in SHARD_FIELDS.items()
+        }
+        self.row = 0
+
+    def close_shard(self, games_done, next_ply):
+        # Flush the current shard and commit it (and the resume point) to the manifest
+        for array in self.shard.values():
+            array.flush()
+        self.manifest['shards'].append({
+            'index': len(self.manifest['shards']),
+            'positions': self.row,
+        })
+        self.manifest['games_done'] = games_done
+        self.manifest['next_ply'] = next_ply
+        self.write_manifest()
+        self.shard = None
+        self.row = 0
+
+    def add_position(self, board, result, codes):
+        if self.shard is None:
+            self.open_shard()
+        row = self.row
+        encode_board(board, codes)
+        self.shard['boards'][row] = to_planes(codes)[0]
+        mask = self.shard['moves'][row]
+        mask[:] = False
+        for (sr, sc), (er, ec) in board.legal_moves():
+            mask[sr * 8 + sc, er * 8 + ec] = True
+        self.shard['turns'][row] = 1 if board.current_turn() == 'white' else -1
+        self.shard['results'][row] = result
+        self.row += 1
+
+    def export(self, games):
+        # Stream (moves, result) games into shards; resumes after the last committed shard
+        games_done = self.manifest['games_done']
+        skip_plies = self.manifest['next_ply']
+        game_count = games_done
+        codes = np.zeros(64, dtype=np.int8)
+
+        for game_index, (moves, result) in enumerate(games):
+            game_count = max(game_count, game_index + 1)
+            if game_index < games_done:
+                continue
+            bad_ply = first_illegal_ply(moves)
+            if bad_ply is not None:
+                # Skip the game but keep exporting; resuming meets it again, so record it once
+                if all(entry[0] != game_index for entry in self.manifest['skipped']):
+                    self.manifest['skipped'].append([game_index, bad_ply, moves[bad_ply]])
+                continue
+            for ply, (board, outcome) in enumerate(iter_positions(moves, result)):
+                if game_index == games_done and ply < skip_plies:
+                    continue
+                self.add_position(board, outcome, codes)
+                if self.row == self.shard_size:
+                    # Resume point: the rest of this game, starting at ply + 1
+                    self.close_shard(game_index, ply + 1)
+
+        if self.shard is not None:
+            self.close_shard(game_count, 0)
+        self.manifest['games_done'] = game_count
+        self.manifest['next_ply'] = 0
+        self.manifest['complete'] = True
+        self.write_manifest()
+        return self.manifest
+
+
+def export_games(path, directory, shard_size=4096):
+    # Export a game file (one game per line) into .npy shards under directory
+    return ShardExporter(directory, shard_size).export(read_games(path))
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Export games to .npy training shards")
+    parser.add_argument("games", help="game file, one game per line: 'e2e4 e7e5 ... 1-0'")
+    parser.add_argument("directory", help="output directory (resumed if it has a manifest)")
+    parser.add_argument("--shard-size", type=int, default=4096)
+    args = parser.parse_args()
+
+    manifest = export_games(args.games, args.directory, args.shard_size)
+    total = sum(shard['positions'] for shard in manifest['shards'])
+    print(f"{manifest['games_done']} games, {total} positions in {len(manifest['shards'])} shards")
+    for game_index, ply, move in manifest['skipped']:
+        print(f"skipped game {game_index + 1}: illegal move {move!r} at ply {ply + 1}")
@@ -1,7 +1,19 @@
-from logic.board import Board
+import fileinput
+import sys
+import time
+
+from logic.annotate import annotate_board, format_annotation
+from logic.board import PROMOTION_PIECES, Board
+from logic.notation import parse_game_line, parse_move
 from logic.piece import King
-from copy import deepcopy
-import copy
+from logic.position import Position
+
+# Final status of a replayed game -> PGN result; checkmate depends on who is mated
+STATUS_RESULTS = {'stalemate': '1/2-1/2', 'threefold': '1/2-1/2', 'seventy-five-move': '1/2-1/2',
+                  'fifty-move': '1/2-1/2', 'ongoing': '*'}
+
+# Statuses that end the game; a fifty-move draw only has to be claimed, so play may go on
+TERMINAL_STATUSES = {'checkmate', 'stalemate', 'threefold', 'seventy-five-move'}
 
 
 
@@ -22,7 +34,8 @@ class Game:
         row = 8 - int(pos[1])                 # 8-1 -> 0-7
         return (row, col)
 
-    def play(self):
+    def play(self, annotate=False):
+        # annotate=True analyses every move once the game is over (see annotate_game)
         while True:
             self.board.display()
             move_input = input(f"{self.current_player}'s move (e.g. e2 e4): ").strip()
@@ -46,11 +59,8 @@ class Game:
                 print("Illegal move for this piece!")
                 continue
 
-            # Simulate move for check validation
-            import copy
-            temp_board = copy.deepcopy(self.board)
-            temp_board.move_piece(start, end)
-            if self.is_in_check(self.current_player, temp_board.board):
+            # Simulate move for check validation on a snapshot
+            if Position.from_board(self.board).apply((start, end)).is_in_check(self.current_player):
                 print("That move would leave your king in check!")
                 continue
 
@@ -75,6 +85,15 @@ class Game:
             # Toggle turn
             self.current_player = opponent
 
+        if annotate:
+            self.annotate_game()
+
+    def annotate_game(self, workers=None, time_budget=0.5):
+        # Print an evaluation for every move played, flagging inaccuracies, mistakes and blunders
+        print("Analysing the game...")
+        for annotation in annotate_board(self.board, workers, time_budget):
+            print(format_annotation(annotation))
+
 
 
 
@@ -106,35 +125,119 @@ class Game:
         return False
 
     def is_legal_move(self, from_pos, to_pos):
-        piece = self.board.get_piece(from_pos)
-        if not piece or piece.color != self.current_turn:
+        piece = self.board.get_piece(*from_pos)
+        if not piece or piece.color != self.current_player:
             return False
 
-        legal_moves = piece.get_legal_moves(self.board.board, from_pos)
+        legal_moves = piece.get_legal_moves(self.board.board, from_pos, self.board.en_passant_target)
         if to_pos not in legal_moves:
             return False
 
-        # Simulate move and check if king is left in check
-        backup_board = copy.deepcopy(self.board.board)
-        self.board.move_piece(from_pos, to_pos)
-
-        in_check = self.is_in_check(self.current_turn)
-
-        # Undo the move
-        self.board.board = backup_board
-
-        return not in_check
+        # Try the move on an immutable snapshot; the live board is never touched
+        position = Position.from_board(self.board).apply((from_pos, to_pos))
+        return not position.is_in_check(self.current_player)
 
     def has_legal_moves(self, color):
-        for r in range(8):
-            for c in range(8):
-                piece = self.board.board[r][c]
-                if piece and piece.color == color:
-                    legal_moves = piece.get_legal_moves(self.board.board, (r, c))
-                    for move in legal_moves:
-                        temp_board = deepcopy(self.board)
-                        temp_board.move_piece((r, c), move)
-                        if not self.is_in_check(color, temp_board.board):
-                            return True
-        return False
-
+        position = Position.from_board(self.board)
+        if position.turn != color[0]:
+            position = position._replace(turn=color[0], en_passant=-1)
+        return bool(position.legal_moves())
+
+    def make_move(self, start, end, promotion=None):
+        # Validate and play one move the way play() does, without display; False if illegal
+        if not self.is_legal_move(start, end):
+            return False
+        result = self.board.move_piece(start, end)
+        if isinstance(result, tuple) and result[0] == 'promote':
+            r, c = result[1]
+            self.board.board[r][c] = PROMOTION_PIECES[(promotion or 'Q').upper()](self.current_player)
+            self.board.record_promotion((r, c))
+        self.current_player = self.board.current_turn()
+        return True
+
+    def status(self):
+        # 'checkmate', 'stalemate', a Board.get_draw_status() rule name, or 'ongoing'.
+        # Mate comes first: a mate on the 100th quiet ply is still a mate
+        color = self.current_player
+        if not self.has_legal_moves(color):
+            return 'checkmate' if self.is_in_check(color) else 'stalemate'
+        return self.board.get_draw_status() or 'ongoing'
+
+
+def replay(moves, game=None):
+    # Replay move strings ('e2e4', 'e7e8q') through Game.make_move, without display or prompts.
+    # Stops at the first illegal or unparseable move, or once the game is over.
+    # Returns (plies played, index of the illegal move or None, final status, game)
+    game = game or Game()
+    status = game.status()
+    for ply, move_str in enumerate(moves):
+        if status in TERMINAL_STATUSES:
+            return ply, None, status, game  # Moves after the end are not played
+        try:
+            start, end, promotion = parse_move(move_str)
+        except ValueError:
+            return ply, ply, status, game
+        if not game.make_move(start, end, promotion):
+            return ply, ply, status, game
+        status = game.status()
+    return len(moves), None, status, game
+
+
+def format_replay(number, moves, plies, illegal, status, game):
+    # One result line, e.g. 'game 3: 41 plies, checkmate 1-0' or
+    # 'game 4: illegal move 'e2e5' at ply 7, 6 plies, ongoing *'
+    if status == 'checkmate':
+        result = '0-1' if game.current_player == 'white' else '1-0'
+    else:
+        result = STATUS_RESULTS[status]
+    line = f"game {number}: "
+    if illegal is not None:
+        line += f"illegal move {moves[illegal]!r} at ply {illegal + 1}, "
+    line += f"{plies} plies, {status} {result}"
+    if illegal is None and plies < len(moves):
+        line += f" ({len(moves) - plies} moves after the end ignored)"
+    return line + "\n"
+
+
+def run_batch(lines, out):
+    # Replay one game per line ('e2e4 e7e5 ... 1-0'), writing a result line per game to out.
+    # Returns (games, plies, illegal games)
+    games = plies = illegal_games = 0
+    for line in lines:
+        if not line.strip() or line.startswith('#'):
+            continue
+        moves, _ = parse_game_line(line)
+        played, illegal, status, game = replay(moves)
+        games += 1
+        plies += played
+        illegal_games += illegal is not None
+        out.write(format_replay(games, moves, played, illegal, status, game))
+    return games, plies, illegal_games
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Play in the console, or replay scripted games with --batch")
+    parser.add_argument("--batch", nargs="*", metavar="FILE",
+                        help="replay game files, one game per line ('-' or none for stdin)")
+    parser.add_argument("--output", help="write result lines here instead of stdout")
+    parser.add_argument("--annotate", action="store_true", help="analyse every move when the game ends")
+    args = parser.parse_args()
+
+    if args.batch is None:
+        Game().play(args.annotate)
+        sys.exit()
+
+    # One large buffered writer; nothing is flushed until the buffer fills or the run ends
+    if args.output:
+        out = open(args.output, 'w', buffering=1 << 16)
+    else:
+        out = open(sys.stdout.fileno(), 'w', buffering=1 << 16, closefd=False)
+    start = time.perf_counter()
+    with fileinput.input(args.batch or ['-']) as lines:
+        games, plies, illegal_games = run_batch(lines, out)
+    elapsed = time.perf_counter() - start
+    out.write(f"{games} games ({illegal_games} with illegal moves), {plies} plies in {elapsed:.2f}s "
+              f"({games / elapsed:.1f} games/s, {plies / elapsed:.0f} plies/s)\n")
+    out.close()
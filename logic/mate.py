@@ -0,0 +1,243 @@
+import itertools
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from logic.board import Board
+from logic.notation import move_to_uci
+from logic.piece import Pawn
+from logic.search import SearchStopped, zobrist_hash
+
+# Proof/disproof numbers at or above INFINITY mean 'proven' / 'disproven'
+INFINITY = 10 ** 9
+
+
+class MateSolver:
+    # Depth-first proof-number search (df-pn) for forced mates.
+    # OR nodes: the attacker (side to move at the root) picks a move.
+    # AND nodes: every defender reply must still lose.
+    # Table entries are keyed by (zobrist key, plies left) -> (proof, disproof),
+    # so there are no cycles and each plies-left bound is solved separately.
+    def __init__(self, board, max_nodes=200000, table_size=200000):
+        self.board = board
+        self.max_nodes = max_nodes
+        self.table_size = table_size
+        self.table = {}
+        self.nodes = 0
+
+    def legal_moves(self):
+        # Legal (start, end, promotion) moves, checking moves first; all promotions included
+        board = self.board
+        color = board.current_turn()
+        opponent = 'black' if color == 'white' else 'white'
+        checks, quiet = [], []
+        for row in range(8):
+            for col in range(8):
+                piece = board.board[row][col]
+                if piece is None or piece.color != color:
+                    continue
+                for end in piece.get_legal_moves(board.board, (row, col), board.en_passant_target):
+                    promotions = 'QRBN' if isinstance(piece, Pawn) and end[0] in (0, 7) else [None]
+                    for promotion in promotions:
+                        board.apply_move((row, col), end, promotion)
+                        if not board.is_in_check(color):
+                            move = ((row, col), end, promotion)
+                            (checks if board.is_in_check(opponent) else quiet).append(move)
+                        board.undo_move()
+        return checks + quiet
+
+    def lookup(self, key):
+        return self.table.get(key, (1, 1))
+
+    def store(self, key, proof, disproof):
+        # Bounded table: drop the oldest quarter when full
+        if key not in self.table and len(self.table) >= self.table_size:
+            for old in list(itertools.islice(self.table, max(1, self.table_size // 4))):
+                del self.table[old]
+        self.table[key] = (proof, disproof)
+
+    def child_keys(self, moves, remaining):
+        keys = []
+        for move in moves:
+            self.board.apply_move(*move)
+            keys.append((zobrist_hash(self.board), remaining - 1))
+            self.board.undo_move()
+        return keys
+
+    def mid(self, remaining, or_node, proof_threshold, disproof_threshold):
+        # Expand the current position until its proof or disproof number reaches a threshold
+        self.nodes += 1
+        if self.nodes > self.max_nodes:
+            raise SearchStopped
+        key = (zobrist_hash(self.board), remaining)
+
+        if or_node and remaining == 0:
+            self.store(key, INFINITY, 0)  # Attacker is out of moves
+            return
+        moves = self.legal_moves()
+        if not moves:
+            mated = self.board.is_in_check(self.board.current_turn())
+            if mated and not or_node:
+                self.store(key, 0, INFINITY)  # Defender is checkmated
+            else:
+                self.store(key, INFINITY, 0)  # Attacker mated or stalemate
+            return
+        if remaining == 0:
+            self.store(key, INFINITY, 0)  # Defender survived the last ply
+            return
+
+        keys = self.child_keys(moves, remaining)
+        while True:
+            values = [self.lookup(child) for child in keys]
+            if or_node:
+                proof = min(p for p, _ in values)
+                disproof = min(INFINITY, sum(d for _, d in values))
+                order = sorted(range(len(values)), key=lambda i: values[i][0])
+            else:
+                proof = min(INFINITY, sum(p for p, _ in values))
+                disproof = min(d for _, d in values)
+                order = sorted(range(len(values)), key=lambda i: values[i][1])
+
+            if proof >= proof_threshold or disproof >= disproof_threshold:
+                self.store(key, proof, disproof)
+                return
+
+            best = order[0]
+            child_proof, child_disproof = values[best]
+            if or_node:
+                second = values[order[1]][0] if len(order) > 1 else INFINITY
+                child_proof_threshold = min(proof_threshold, second + 1)
+                child_disproof_threshold = min(INFINITY, disproof_threshold - disproof + child_disproof)
+            else:
+                second = values[order[1]][1] if len(order) > 1 else INFINITY
+                child_proof_threshold = min(INFINITY, proof_threshold - proof + child_proof)
+                child_disproof_threshold = min(disproof_threshold, second + 1)
+
+            self.board.apply_move(*moves[best])
+            try:
+                self.mid(remaining - 1, not or_node, child_proof_threshold, child_disproof_threshold)
+            finally:
+                self.board.undo_move()
+
+    def prove(self, remaining, or_node):
+        # Solve the current position completely; True if the attacker mates within remaining plies
+        proof, disproof = self.lookup((zobrist_hash(self.board), remaining))
+        if proof != 0 and disproof != 0:
+            self.mid(remaining, or_node, INFINITY, INFINITY)
+            proof, _ = self.lookup((zobrist_hash(self.board), remaining))
+        return proof == 0
+
+    def mate_distance(self, limit):
+        # Fewest plies (odd, up to limit) in which the attacker to move forces mate, or None
+        for plies in range(1, limit + 1, 2):
+            if self.prove(plies, True):
+                return plies
+        return None
+
+    def solution_line(self, plies):
+        # Main line of a proven mate: attacker takes a proven move, defender the longest resistance
+        line = []
+        made = 0
+        try:
+            while plies > 0:
+                moves = self.legal_moves()
+                if not moves:
+                    break
+                chosen = None
+                if len(line) % 2 == 0:  # Attacker
+                    for move in moves:
+                        self.board.apply_move(*move)
+                        proven = self.prove(plies - 1, False)
+                        self.board.undo_move()
+                        if proven:
+                            chosen = move
+                            break
+                else:  # Defender: reply after which the mate takes longest
+                    longest = -1
+                    for move in moves:
+                        self.board.apply_move(*move)
+                        distance = self.mate_distance(plies - 1)
+                        self.board.undo_move()
+                        if distance is not None and distance > longest:
+                            chosen, longest = move, distance
+                if chosen is None:
+                    break
+                line.append(chosen)
+                self.board.apply_move(*chosen)
+                made += 1
+                plies -= 1
+        finally:
+            for _ in range(made):
+                self.board.undo_move()
+        return line
+
+    def solve(self, max_moves):
+        # Look for the shortest forced mate in 1..max_moves moves
+        try:
+            plies = self.mate_distance(2 * max_moves - 1)
+            if plies is None:
+                return {'status': 'no-mate', 'moves': None, 'line': [], 'nodes': self.nodes}
+            line = self.solution_line(plies)
+        except SearchStopped:
+            return {'status': 'unknown', 'moves': None, 'line': [], 'nodes': self.nodes}
+        return {
+            'status': 'mate',
+            'moves': (plies + 1) // 2,
+            'line': [move_to_uci(*move) for move in line],
+            'nodes': self.nodes,
+        }
+
+
+def solve_mate(position, max_moves=3, max_nodes=200000, table_size=200000):
+    # position: Board or FEN string. Returns a dict with status 'mate', 'no-mate' or 'unknown'
+    board = Board.from_fen(position) if isinstance(position, str) else position
+    return MateSolver(board, max_nodes, table_size).solve(max_moves)
+
+
+def parse_puzzle_line(line, default_moves):
+    # 'FEN' or 'FEN; N' (mate in N) -> (fen, N)
+    fen, _, moves = line.partition(';')
+    return fen.strip(), int(moves) if moves.strip() else default_moves
+
+
+def _solve_puzzle(args):
+    fen, max_moves, max_nodes = args
+    start = time.perf_counter()
+    result = solve_mate(fen, max_moves, max_nodes)
+    result['fen'] = fen
+    result['seconds'] = time.perf_counter() - start
+    return result
+
+
+def solve_file(path, max_moves=3, workers=None, max_nodes=200000):
+    # Solve every puzzle in a file across a process pool; yields results in file order
+    with open(path) as f:
+        puzzles = [parse_puzzle_line(line, max_moves) for line in f
+                   if line.strip() and not line.startswith('#')]
+    tasks = [(fen, moves, max_nodes) for fen, moves in puzzles]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield from pool.map(_solve_puzzle, tasks, chunksize=max(1, len(tasks) // (4 * (workers or os.cpu_count() or 1))))
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Prove or refute forced mates with df-pn")
+    parser.add_argument("puzzles", help="file with one 'FEN' or 'FEN; N' per line")
+    parser.add_argument("--max-moves", type=int, default=3, help="default N for mate in N")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--max-nodes", type=int, default=200000, help="node budget per puzzle")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    solved = total = 0
+    for result in solve_file(args.puzzles, args.max_moves, args.workers, args.max_nodes):
+        total += 1
+        if result['status'] == 'mate':
+            solved += 1
+            summary = f"mate in {result['moves']}: {' '.join(result['line'])}"
+        else:
+            summary = result['status']
+        print(f"{result['fen']}  ->  {summary}  ({result['nodes']} nodes, {result['seconds']:.2f}s)")
+    elapsed = time.perf_counter() - start
+    print(f"{solved}/{total} solved in {elapsed:.2f}s ({solved / elapsed:.2f} solves/s, {args.workers} workers)")
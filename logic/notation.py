@@ -0,0 +1,83 @@
+# Coordinate notation helpers shared by the exporters and protocol front ends.
+# Squares are (row, col) with row 0 = rank 8, as in Board.board.
+
+RESULTS = {'1-0': 1, '0-1': -1, '1/2-1/2': 0, '*': 0}
+
+
+def square_to_index(square):
+    # 'e2' -> (6, 4)
+    col = ord(square[0].lower()) - ord('a')
+    row = 8 - int(square[1])
+    if not (0 <= row < 8 and 0 <= col < 8):
+        raise ValueError(f"Invalid square: {square!r}")
+    return (row, col)
+
+
+def index_to_square(pos):
+    # (6, 4) -> 'e2'
+    row, col = pos
+    return f"{chr(ord('a') + col)}{8 - row}"
+
+
+def parse_move(move_str):
+    # 'e2e4', 'e2 e4' or 'e7e8q' -> (start, end, promotion or None)
+    text = move_str.replace(' ', '').replace('-', '')
+    if len(text) not in (4, 5):
+        raise ValueError(f"Invalid move: {move_str!r}")
+    promotion = text[4].upper() if len(text) == 5 else None
+    if promotion is not None and promotion not in 'QRBN':
+        raise ValueError(f"Invalid promotion piece: {move_str!r}")
+    return square_to_index(text[:2]), square_to_index(text[2:4]), promotion
+
+
+def move_to_uci(start, end, promotion=None):
+    # ((6, 4), (4, 4)) -> 'e2e4'
+    text = index_to_square(start) + index_to_square(end)
+    return text + promotion.lower() if promotion else text
+
+
+def parse_game_line(line):
+    # 'e2e4 e7e5 ... 1-0' -> (['e2e4', 'e7e5', ...], 1); the result token is optional
+    tokens = line.split()
+    result = 0
+    if tokens and tokens[-1] in RESULTS:
+        result = RESULTS[tokens.pop()]
+    return tokens, result
+
+
+def move_to_san(board, start, end, promotion=None):
+    # Standard algebraic notation ('Nbd7', 'exd5', 'e8=Q+', 'O-O') for a legal move on board
+    piece = board.get_piece(*start)
+    (sr, sc), (er, ec) = start, end
+
+    if piece.symbol == 'K' and abs(ec - sc) == 2:
+        san = 'O-O' if ec == 6 else 'O-O-O'
+    elif piece.symbol == 'P':
+        san = index_to_square(end)
+        if sc != ec:  # Pawns only change file when capturing (including en passant)
+            san = index_to_square(start)[0] + 'x' + san
+        if er in (0, 7):
+            promotion = (promotion or 'Q').upper()
+            san += '=' + promotion
+    else:
+        # Disambiguate against other pieces of the same kind that can reach end
+        rivals = [s for s, e in board.legal_moves(piece.color)
+                  if e == end and s != start and board.get_piece(*s).symbol == piece.symbol]
+        disambiguation = ''
+        if rivals:
+            if all(s[1] != sc for s in rivals):
+                disambiguation = index_to_square(start)[0]
+            elif all(s[0] != sr for s in rivals):
+                disambiguation = index_to_square(start)[1]
+            else:
+                disambiguation = index_to_square(start)
+        capture = 'x' if board.get_piece(er, ec) is not None else ''
+        san = piece.symbol + disambiguation + capture + index_to_square(end)
+
+    # Check / mate suffix: play the move, look, take it back
+    board.apply_move(start, end, promotion)
+    opponent = board.current_turn()
+    if board.is_in_check(opponent):
+        san += '#' if not board.legal_moves(opponent) else '+'
+    board.undo_move()
+    return san
@@ -1,5 +1,48 @@
 from abc import ABC, abstractmethod
 
+# Move/ray lookup tables, built once at import. Every table is indexed [row][col]
+# like Board.board, so generation walks precomputed squares instead of re-deriving
+# deltas and bounds-checking each step.
+ROOK_DIRECTIONS = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+BISHOP_DIRECTIONS = [(-1, -1), (-1, 1), (1, -1), (1, 1)]
+KNIGHT_DELTAS = [(-2, -1), (-2, 1), (-1, -2), (-1, 2),
+                 (1, -2), (1, 2), (2, -1), (2, 1)]
+KING_DELTAS = [(-1, -1), (-1, 0), (-1, 1),
+               (0, -1),          (0, 1),
+               (1, -1), (1, 0), (1, 1)]
+
+
+def _jump_table(deltas):
+    # On-board target squares for each origin square
+    return [[[(row + dr, col + dc) for dr, dc in deltas
+              if 0 <= row + dr < 8 and 0 <= col + dc < 8]
+             for col in range(8)] for row in range(8)]
+
+
+def _ray_table(directions):
+    # For each origin square, one list of squares per direction (nearest first);
+    # directions that leave the board immediately are dropped
+    table = [[[] for _ in range(8)] for _ in range(8)]
+    for row in range(8):
+        for col in range(8):
+            for dr, dc in directions:
+                ray = []
+                r, c = row + dr, col + dc
+                while 0 <= r < 8 and 0 <= c < 8:
+                    ray.append((r, c))
+                    r += dr
+                    c += dc
+                if ray:
+                    table[row][col].append(ray)
+    return table
+
+
+KNIGHT_TARGETS = _jump_table(KNIGHT_DELTAS)
+KING_TARGETS = _jump_table(KING_DELTAS)
+ROOK_RAYS = _ray_table(ROOK_DIRECTIONS)
+BISHOP_RAYS = _ray_table(BISHOP_DIRECTIONS)
+QUEEN_RAYS = _ray_table(ROOK_DIRECTIONS + BISHOP_DIRECTIONS)
+
 # Abstract base class for all chess pieces
 class Piece(ABC):
     def __init__(self, color):
@@ -14,6 +57,27 @@ class Piece(ABC):
     def is_opponent(self, piece):
         return piece is not None and piece.color != self.color
 
+    # Walk precomputed rays until blocked; an enemy blocker can be captured
+    def slide_moves(self, board, rays):
+        legal_moves = []
+        color = self.color
+        for ray in rays:
+            for r, c in ray:
+                target = board[r][c]
+                if target is None:
+                    legal_moves.append((r, c))
+                else:
+                    if target.color != color:
+                        legal_moves.append((r, c))
+                    break
+        return legal_moves
+
+    # Precomputed jump targets that are empty or hold an enemy piece
+    def jump_moves(self, board, targets):
+        color = self.color
+        return [(r, c) for r, c in targets
+                if board[r][c] is None or board[r][c].color != color]
+
     # Represent piece with symbol (uppercase for white, lowercase for black)
     def __str__(self):
         return self.symbol.upper() if self.color == 'white' else self.symbol.lower()
@@ -61,26 +125,7 @@ class Rook(Piece):
 
     def get_legal_moves(self, board, pos, en_passant_target=None):
         row, col = pos
-        legal_moves = []
-
-        # Movement in 4 straight directions
-        directions = [(-1, 0), (1, 0), (0, -1), (0, 1)]
-
-        for dr, dc in directions:
-            r, c = row + dr, col + dc
-            while 0 <= r < 8 and 0 <= c < 8:
-                target = board[r][c]
-                if target is None:
-                    legal_moves.append((r, c))
-                elif self.is_opponent(target):
-                    legal_moves.append((r, c))
-                    break
-                else:
-                    break
-                r += dr
-                c += dc
-
-        return legal_moves
+        return self.slide_moves(board, ROOK_RAYS[row][col])
 
 
 # Knight class with L-shaped moves
@@ -89,20 +134,7 @@ class Knight(Piece):
 
     def get_legal_moves(self, board, pos, en_passant_target=None):
         row, col = pos
-        legal_moves = []
-
-        # 8 L-shaped jump possibilities
-        deltas = [(-2, -1), (-2, 1), (-1, -2), (-1, 2),
-                  (1, -2), (1, 2), (2, -1), (2, 1)]
-
-        for dr, dc in deltas:
-            r, c = row + dr, col + dc
-            if 0 <= r < 8 and 0 <= c < 8:
-                target = board[r][c]
-                if target is None or self.is_opponent(target):
-                    legal_moves.append((r, c))
-
-        return legal_moves
+        return self.jump_moves(board, KNIGHT_TARGETS[row][col])
 
 
 # Bishop class with diagonal movement
@@ -111,24 +143,7 @@ class Bishop(Piece):
 
     def get_legal_moves(self, board, pos, en_passant_target=None):
         row, col = pos
-        legal_moves = []
-        directions = [(-1, -1), (-1, 1), (1, -1), (1, 1)]
-
-        for dr, dc in directions:
-            r, c = row + dr, col + dc
-            while 0 <= r < 8 and 0 <= c < 8:
-                target = board[r][c]
-                if target is None:
-                    legal_moves.append((r, c))
-                elif self.is_opponent(target):
-                    legal_moves.append((r, c))
-                    break
-                else:
-                    break
-                r += dr
-                c += dc
-
-        return legal_moves
+        return self.slide_moves(board, BISHOP_RAYS[row][col])
 
 
 # Queen combines rook and bishop moves
@@ -137,27 +152,7 @@ class Queen(Piece):
 
     def get_legal_moves(self, board, pos, en_passant_target=None):
         row, col = pos
-        legal_moves = []
-        directions = [
-            (-1, 0), (1, 0), (0, -1), (0, 1),  # Rook moves
-            (-1, -1), (-1, 1), (1, -1), (1, 1) # Bishop moves
-        ]
-
-        for dr, dc in directions:
-            r, c = row + dr, col + dc
-            while 0 <= r < 8 and 0 <= c < 8:
-                target = board[r][c]
-                if target is None:
-                    legal_moves.append((r, c))
-                elif self.is_opponent(target):
-                    legal_moves.append((r, c))
-                    break
-                else:
-                    break
-                r += dr
-                c += dc
-
-        return legal_moves
+        return self.slide_moves(board, QUEEN_RAYS[row][col])
 
 
 # King class with castling logic
@@ -166,19 +161,9 @@ class King(Piece):
 
     def get_legal_moves(self, board, pos, en_passant_target=None):
         row, col = pos
-        legal_moves = []
 
-        # All 8 adjacent squares
-        deltas = [(-1, -1), (-1, 0), (-1, 1),
-                  (0, -1),          (0, 1),
-                  (1, -1), (1, 0), (1, 1)]
-
-        for dr, dc in deltas:
-            r, c = row + dr, col + dc
-            if 0 <= r < 8 and 0 <= c < 8:
-                target = board[r][c]
-                if target is None or self.is_opponent(target):
-                    legal_moves.append((r, c))
+        # All adjacent squares
+        legal_moves = self.jump_moves(board, KING_TARGETS[row][col])
 
         # ✅ Castling: move king 2 squares, rook jumps over
         if not getattr(self, "has_moved", False):
@@ -210,6 +195,15 @@ class King(Piece):
             for c in range(8):
                 piece = board[r][c]
                 if piece and piece.color == opponent_color:
-                    if square in piece.get_legal_moves(board, (r, c)):
+                    # Kings and pawns attack differently from how they move; asking the
+                    # enemy king for its moves would recurse through its castling checks
+                    if isinstance(piece, King):
+                        if max(abs(r - r_sq), abs(c - c_sq)) == 1:
+                            return True
+                    elif isinstance(piece, Pawn):
+                        direction = -1 if piece.color == 'white' else 1
+                        if r + direction == r_sq and abs(c - c_sq) == 1:
+                            return True
+                    elif square in piece.get_legal_moves(board, (r, c)):
                         return True
         return False
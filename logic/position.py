@@ -0,0 +1,236 @@
+from typing import NamedTuple
+
+from logic.notation import parse_move
+from logic.piece import BISHOP_RAYS, KING_TARGETS, KNIGHT_TARGETS, ROOK_RAYS, QUEEN_RAYS
+
+EMPTY = ord('.')
+
+# Castling right lost when a move starts or ends on these squares (rook/king homes)
+CASTLING_SQUARES = {56: 'Q', 63: 'K', 0: 'q', 7: 'k', 60: 'KQ', 4: 'kq'}
+
+SLIDER_RAYS = {'B': BISHOP_RAYS, 'R': ROOK_RAYS, 'Q': QUEEN_RAYS}
+JUMP_TARGETS = {'N': KNIGHT_TARGETS, 'K': KING_TARGETS}
+
+
+class Position(NamedTuple):
+    # Immutable snapshot of a Board. squares is 64 bytes in Board.board order
+    # ('.' empty, FEN letters for pieces); everything else is small immutable state.
+    # Hashable, picklable and safe to share between threads and processes.
+    squares: bytes
+    turn: str          # 'w' or 'b'
+    castling: str      # FEN castling field, '-' for none
+    en_passant: int    # Square index behind a pawn that just moved two squares, or -1
+    halfmove: int = 0
+    fullmove: int = 1
+
+    @classmethod
+    def from_board(cls, board):
+        squares = bytes(ord(str(piece)) if piece else EMPTY for row in board.board for piece in row)
+        ep = board.en_passant_target
+        return cls(squares, board.current_turn()[0], board.get_castling_rights(),
+                   ep[0] * 8 + ep[1] if ep else -1, board.halfmove_clock,
+                   1 + (len(board.move_history) + board.ply_offset) // 2)
+
+    @classmethod
+    def from_fen(cls, fen):
+        fields = fen.split()
+        squares = bytearray()
+        for ch in fields[0]:
+            if ch.isdigit():
+                squares.extend([EMPTY] * int(ch))
+            elif ch != '/':
+                squares.append(ord(ch))
+        ep = fields[3] if len(fields) > 3 else '-'
+        return cls(bytes(squares),
+                   fields[1] if len(fields) > 1 else 'w',
+                   fields[2] if len(fields) > 2 else '-',
+                   -1 if ep == '-' else (8 - int(ep[1])) * 8 + ord(ep[0]) - ord('a'),
+                   int(fields[4]) if len(fields) > 4 else 0,
+                   int(fields[5]) if len(fields) > 5 else 1)
+
+    def to_fen(self):
+        ranks = []
+        for row in range(8):
+            rank, empty = "", 0
+            for code in self.squares[row * 8:row * 8 + 8]:
+                if code == EMPTY:
+                    empty += 1
+                    continue
+                if empty:
+                    rank += str(empty)
+                    empty = 0
+                rank += chr(code)
+            ranks.append(rank + (str(empty) if empty else ""))
+        ep = "-"
+        if self.en_passant >= 0:
+            ep = f"{chr(ord('a') + self.en_passant % 8)}{8 - self.en_passant // 8}"
+        return f"{'/'.join(ranks)} {self.turn} {self.castling} {ep} {self.halfmove} {self.fullmove}"
+
+    def to_board(self):
+        # Mutable Board for the GUI or anything that still needs Piece objects
+        from logic.board import Board
+        return Board.from_fen(self.to_fen())
+
+    @property
+    def key(self):
+        # Identity for repetition / memoization: everything except the move clocks
+        return self[:4]
+
+    def piece_at(self, row, col):
+        # FEN letter of the piece on (row, col), or None
+        code = self.squares[row * 8 + col]
+        return None if code == EMPTY else chr(code)
+
+    # ------------------------------------------------------------------- moves
+
+    def apply(self, move):
+        # New Position after move: (start, end[, promotion]) or a UCI string like 'e7e8q'.
+        # The move is not validated; use legal_moves() for that.
+        if isinstance(move, str):
+            start, end, promotion = parse_move(move)
+        else:
+            start, end = move[0], move[1]
+            promotion = move[2] if len(move) > 2 else None
+        s, e = start[0] * 8 + start[1], end[0] * 8 + end[1]
+
+        squares = bytearray(self.squares)
+        piece = chr(squares[s])
+        kind = piece.upper()
+        white = piece.isupper()
+        captured = squares[e] != EMPTY
+        squares[e], squares[s] = squares[s], EMPTY
+
+        en_passant = -1
+        if kind == 'P':
+            if e == self.en_passant and not captured and s % 8 != e % 8:
+                squares[s - s % 8 + e % 8] = EMPTY  # Pawn taken en passant
+                captured = True
+            if abs(e - s) == 16:
+                en_passant = (s + e) // 2
+            if e // 8 in (0, 7):
+                letter = (promotion or 'Q').upper()
+                squares[e] = ord(letter if white else letter.lower())
+        elif kind == 'K' and abs(e - s) == 2:
+            rook_from, rook_to = (s + 3, s + 1) if e > s else (s - 4, s - 1)
+            squares[rook_to], squares[rook_from] = squares[rook_from], EMPTY
+
+        castling = self.castling
+        for square in (s, e):
+            for flag in CASTLING_SQUARES.get(square, ''):
+                castling = castling.replace(flag, '')
+
+        return Position(bytes(squares),
+                        'b' if self.turn == 'w' else 'w',
+                        castling or '-',
+                        en_passant,
+                        0 if kind == 'P' or captured else self.halfmove + 1,
+                        self.fullmove + (self.turn == 'b'))
+
+    def is_attacked(self, row, col, by_white):
+        # True if the given side attacks (row, col)
+        squares = self.squares
+        own = str.isupper if by_white else str.islower
+
+        def holds(r, c, kinds):
+            code = squares[r * 8 + c]
+            return code != EMPTY and own(chr(code)) and chr(code).upper() in kinds
+
+        pawn_row = row + 1 if by_white else row - 1  # Pawns attack towards the enemy side
+        if 0 <= pawn_row < 8:
+            for c in (col - 1, col + 1):
+                if 0 <= c < 8 and holds(pawn_row, c, 'P'):
+                    return True
+        if any(holds(r, c, 'N') for r, c in KNIGHT_TARGETS[row][col]):
+            return True
+        if any(holds(r, c, 'K') for r, c in KING_TARGETS[row][col]):
+            return True
+        for rays, kinds in ((ROOK_RAYS, 'RQ'), (BISHOP_RAYS, 'BQ')):
+            for ray in rays[row][col]:
+                for r, c in ray:
+                    if squares[r * 8 + c] != EMPTY:
+                        if holds(r, c, kinds):
+                            return True
+                        break
+        return False
+
+    def is_in_check(self, color=None):
+        # color: 'white' / 'black', default the side to move
+        white = (color or ('white' if self.turn == 'w' else 'black')) == 'white'
+        king = self.squares.find(b'K' if white else b'k')
+        if king < 0:
+            return False
+        return self.is_attacked(king // 8, king % 8, not white)
+
+    def pseudo_legal_moves(self):
+        # (start, end, promotion) moves for the side to move, same rules as logic.piece
+        white = self.turn == 'w'
+        own = str.isupper if white else str.islower
+        squares = self.squares
+        moves = []
+
+        def free_or_enemy(r, c):
+            code = squares[r * 8 + c]
+            return code == EMPTY or not own(chr(code))
+
+        for index, code in enumerate(squares):
+            if code == EMPTY or not own(chr(code)):
+                continue
+            row, col = divmod(index, 8)
+            kind = chr(code).upper()
+
+            if kind == 'P':
+                direction = -1 if white else 1
+                start_row, last_row = (6, 0) if white else (1, 7)
+                targets = []
+                r = row + direction
+                if 0 <= r < 8 and squares[r * 8 + col] == EMPTY:
+                    targets.append((r, col))
+                    if row == start_row and squares[(r + direction) * 8 + col] == EMPTY:
+                        targets.append((r + direction, col))
+                for c in (col - 1, col + 1):
+                    if 0 <= r < 8 and 0 <= c < 8:
+                        target = squares[r * 8 + c]
+                        if (target != EMPTY and not own(chr(target))) or r * 8 + c == self.en_passant:
+                            targets.append((r, c))
+                for target in targets:
+                    if target[0] == last_row:
+                        moves.extend(((row, col), target, promotion) for promotion in 'QRBN')
+                    else:
+                        moves.append(((row, col), target, None))
+            elif kind in JUMP_TARGETS:
+                moves.extend(((row, col), (r, c), None)
+                             for r, c in JUMP_TARGETS[kind][row][col] if free_or_enemy(r, c))
+            else:
+                for ray in SLIDER_RAYS[kind][row][col]:
+                    for r, c in ray:
+                        if squares[r * 8 + c] == EMPTY:
+                            moves.append(((row, col), (r, c), None))
+                        else:
+                            if not own(chr(squares[r * 8 + c])):
+                                moves.append(((row, col), (r, c), None))
+                            break
+
+            if kind == 'K':
+                moves.extend(self._castling_moves(row, col, white))
+        return moves
+
+    def _castling_moves(self, row, col, white):
+        # Same conditions as King.get_legal_moves: path empty, king and crossed squares safe
+        flags = ('K', 'Q') if white else ('k', 'q')
+        if col != 4 or row != (7 if white else 0):
+            return []
+        base = row * 8
+        moves = []
+        if flags[0] in self.castling and self.squares[base + 5] == EMPTY and self.squares[base + 6] == EMPTY:
+            if not any(self.is_attacked(row, c, not white) for c in (4, 5, 6)):
+                moves.append(((row, 4), (row, 6), None))
+        if flags[1] in self.castling and all(self.squares[base + c] == EMPTY for c in (1, 2, 3)):
+            if not any(self.is_attacked(row, c, not white) for c in (4, 2, 3)):
+                moves.append(((row, 4), (row, 2), None))
+        return moves
+
+    def legal_moves(self, start=None):
+        # Pseudo-legal moves that don't leave the mover's king in check, optionally only from start
+        mover = 'white' if self.turn == 'w' else 'black'
+        return [move for move in self.pseudo_legal_moves()
+                if (start is None or move[0] == start) and not self.apply(move).is_in_check(mover)]
@@ -0,0 +1,363 @@
+import multiprocessing as mp
+import queue
+import random
+import time
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from logic.board import PROMOTION_PIECES
+from logic.evaluation import PIECE_VALUES, evaluate
+from logic.piece import Pawn
+
+MATE_SCORE = 30000
+INFINITY = 32000
+MATE_BOUND = MATE_SCORE - 1000  # Scores beyond this are mates, stored relative to the node
+
+# How often parallel_search wakes up to check the deadline and for dead workers
+POLL_SECONDS = 0.1
+
+# Transposition table bound types
+EXACT, LOWER, UPPER = 0, 1, 2
+
+# Zobrist keys, seeded so every worker process derives the same table
+_rng = random.Random(20240611)
+ZOBRIST_PIECES = {
+    (symbol, color): [_rng.getrandbits(64) for _ in range(64)]
+    for symbol in 'PNBRQK' for color in ('white', 'black')
+}
+ZOBRIST_BLACK_TO_MOVE = _rng.getrandbits(64)
+ZOBRIST_CASTLING = {flag: _rng.getrandbits(64) for flag in 'KQkq'}
+ZOBRIST_EN_PASSANT = [_rng.getrandbits(64) for _ in range(8)]
+
+PROMOTION_ORDER = [None] + list(PROMOTION_PIECES)  # Index stored in a packed move
+
+
+def zobrist_hash(board):
+    # 64-bit key of the position, stable across processes (unlike hash() on str)
+    key = 0
+    for row in range(8):
+        for col in range(8):
+            piece = board.board[row][col]
+            if piece:
+                key ^= ZOBRIST_PIECES[(piece.symbol, piece.color)][row * 8 + col]
+    if board.current_turn() == 'black':
+        key ^= ZOBRIST_BLACK_TO_MOVE
+    for flag in board.get_castling_rights():
+        key ^= ZOBRIST_CASTLING.get(flag, 0)
+    if board.en_passant_target:
+        key ^= ZOBRIST_EN_PASSANT[board.en_passant_target[1]]
+    return key
+
+
+def pack_move(move):
+    (sr, sc), (er, ec), promotion = move
+    return (sr * 8 + sc) << 6 | (er * 8 + ec) | PROMOTION_ORDER.index(promotion) << 12
+
+
+def unpack_move(packed):
+    start, end = (packed >> 6) & 63, packed & 63
+    return divmod(start, 8), divmod(end, 8), PROMOTION_ORDER[packed >> 12]
+
+
+class TranspositionTable:
+    # Fixed-size hash table in a flat uint64 array, optionally in shared memory.
+    # Each slot holds (key ^ data, data); a torn write from another process
+    # fails the key check on probe, so no locking is needed (Hyatt's XOR trick).
+    def __init__(self, entries=1 << 16, name=None, create=False):
+        self.entries = 1 << (entries - 1).bit_length()  # Round up to a power of two
+        self.mask = self.entries - 1
+        self.shm = None
+        if name is None and not create:
+            self.slots = np.zeros((self.entries, 2), dtype=np.uint64)
+        else:
+            self.shm = shared_memory.SharedMemory(name=name, create=create, size=self.entries * 16)
+            self.slots = np.ndarray((self.entries, 2), dtype=np.uint64, buffer=self.shm.buf)
+            if create:
+                self.slots[:] = 0
+
+    @property
+    def name(self):
+        return self.shm.name if self.shm else None
+
+    def close(self, unlink=False):
+        if self.shm is not None:
+            self.slots = None
+            self.shm.close()
+            if unlink:
+                self.shm.unlink()
+            self.shm = None
+
+    def probe(self, key):
+        # Return (depth, flag, score, packed_move) or None
+        slot = self.slots[key & self.mask]
+        data = int(slot[1])
+        if int(slot[0]) ^ data != key or data == 0:
+            return None
+        return data & 0xFF, (data >> 8) & 0x3, ((data >> 10) & 0xFFFF) - 32768, data >> 26
+
+    def store(self, key, depth, flag, score, packed_move):
+        slot = self.slots[key & self.mask]
+        old = int(slot[1])
+        if int(slot[0]) ^ old == key and (old & 0xFF) > depth:
+            return  # Keep the deeper result for the same position
+        data = depth | flag << 8 | (score + 32768) << 10 | packed_move << 26
+        slot[1] = data
+        slot[0] = key ^ data
+
+
+class SearchStopped(Exception):
+    pass
+
+
+class Deadline:
+    # Stand-in for a stop Event that 'fires' once the time budget is spent
+    def __init__(self, seconds):
+        self.end = time.monotonic() + seconds
+
+    def is_set(self):
+        return time.monotonic() >= self.end
+
+
+def score_to_table(score, ply):
+    # Mate scores count plies from the root; the table stores them as distance from this node
+    if score >= MATE_BOUND:
+        return score + ply
+    if score <= -MATE_BOUND:
+        return score - ply
+    return score
+
+
+def score_from_table(score, ply):
+    if score >= MATE_BOUND:
+        return score - ply
+    if score <= -MATE_BOUND:
+        return score + ply
+    return score
+
+
+class Search:
+    def __init__(self, board, table=None, node_limit=None, stop_event=None, root_moves=None):
+        self.board = board
+        self.table = table if table is not None else TranspositionTable()
+        self.node_limit = node_limit
+        self.stop_event = stop_event
+        self.root_moves = root_moves  # Optional list of (start, end, promotion) to search at the root
+        self.nodes = 0
+
+    def generate_moves(self, color):
+        # Pseudo-legal (start, end, promotion) moves, captures first (MVV-LVA)
+        board = self.board.board
+        moves = []
+        for row in range(8):
+            for col in range(8):
+                piece = board[row][col]
+                if piece is None or piece.color != color:
+                    continue
+                for er, ec in piece.get_legal_moves(board, (row, col), self.board.en_passant_target):
+                    target = board[er][ec]
+                    order = 0
+                    if target is not None:
+                        order = 10 * PIECE_VALUES[target.symbol] - PIECE_VALUES[piece.symbol] + 10000
+                    promotion = None
+                    if isinstance(piece, Pawn) and er in (0, 7):
+                        promotion = 'Q'
+                        order += 9000
+                    moves.append((order, ((row, col), (er, ec), promotion)))
+        moves.sort(key=lambda item: -item[0])
+        return [move for _, move in moves]
+
+    def make(self, move, color):
+        # Play a pseudo-legal move; undo it and return False if it leaves the king in check
+        start, end, promotion = move
+        self.board.apply_move(start, end, promotion)
+        if self.board.is_in_check(color):
+            self.board.undo_move()
+            return False
+        return True
+
+    def check_limits(self):
+        self.nodes += 1
+        if self.node_limit is not None and self.nodes >= self.node_limit:
+            raise SearchStopped
+        if self.stop_event is not None and self.nodes % 512 == 0 and self.stop_event.is_set():
+            raise SearchStopped
+
+    def negamax(self, depth, alpha, beta, ply):
+        self.check_limits()
+        color = self.board.current_turn()
+        if depth <= 0:
+            score = evaluate(self.board)
+            return score if color == 'white' else -score
+
+        key = zobrist_hash(self.board)
+        entry = self.table.probe(key)
+        tt_move = None
+        if entry is not None:
+            entry_depth, flag, score, packed = entry
+            score = score_from_table(score, ply)
+            tt_move = unpack_move(packed) if packed else None
+            if ply > 0 and entry_depth >= depth:
+                if flag == EXACT or (flag == LOWER and score >= beta) or (flag == UPPER and score <= alpha):
+                    return score
+
+        if ply == 0 and self.root_moves is not None:
+            moves = list(self.root_moves)
+        else:
+            moves = self.generate_moves(color)
+        if tt_move in moves:
+            moves.remove(tt_move)
+            moves.insert(0, tt_move)
+
+        original_alpha = alpha
+        best_score, best_move = -INFINITY, None
+        for move in moves:
+            if not self.make(move, color):
+                continue
+            try:
+                score = -self.negamax(depth - 1, -beta, -alpha, ply + 1)
+            finally:
+                self.board.undo_move()
+            if score > best_score:
+                best_score, best_move = score, move
+            alpha = max(alpha, score)
+            if alpha >= beta:
+                break
+
+        if best_move is None:
+            # No legal move: checkmate (prefer the quickest) or stalemate
+            return -MATE_SCORE + ply if self.board.is_in_check(color) else 0
+
+        flag = EXACT
+        if best_score <= original_alpha:
+            flag = UPPER
+        elif best_score >= beta:
+            flag = LOWER
+        if ply > 0 or self.root_moves is None:  # A restricted root score isn't the position's value
+            self.table.store(key, depth, flag, score_to_table(best_score, ply), pack_move(best_move))
+        if ply == 0:
+            self.root_move = best_move
+        return best_score
+
+    def iterative_deepening(self, max_depth, start_depth=1, on_depth=None):
+        # Search depth by depth; returns (depth, score, move) of the deepest completed one
+        result = (0, None, None)
+        for depth in range(start_depth, max_depth + 1):
+            self.root_move = None
+            try:
+                score = self.negamax(depth, -INFINITY, INFINITY, 0)
+            except SearchStopped:
+                break
+            result = (depth, score, self.root_move)
+            if on_depth is not None:
+                on_depth(depth, score, self.root_move, self.nodes)
+            if self.root_move is None:
+                break  # No legal move at the root, deeper searches won't change that
+        return result
+
+
+def search(board, max_depth, node_limit=None, table=None):
+    # Single-process search; deterministic for a given board, depth and node limit
+    return Search(board, table, node_limit).iterative_deepening(max_depth)
+
+
+def _worker(worker_id, board, table_name, table_entries, max_depth, node_limit, stop_event, results):
+    # Lazy SMP: helpers start one ply deeper on alternate workers, so the pool
+    # spreads across depths and fills the shared table for each other
+    start_depth = 1 + worker_id % 2
+
+    def report(depth, score, move, nodes):
+        results.put(('depth', worker_id, depth, score, move, nodes))
+
+    table = searcher = None
+    try:
+        table = TranspositionTable(table_entries, name=table_name)
+        searcher = Search(board, table, node_limit, stop_event)
+        searcher.iterative_deepening(max_depth, start_depth, report)
+    finally:
+        results.put(('done', worker_id, searcher.nodes if searcher else 0))
+        if table is not None:
+            table.close()
+
+
+def parallel_search(board, max_depth, workers=4, node_limit=None, time_limit=None, table_entries=1 << 18):
+    # Lazy SMP over worker processes sharing one transposition table.
+    # Returns (depth, score, move, total_nodes) for the deepest completed iteration.
+    if workers <= 1:
+        stop = Deadline(time_limit) if time_limit is not None else None
+        searcher = Search(board, TranspositionTable(table_entries), node_limit, stop)
+        depth, score, move = searcher.iterative_deepening(max_depth)
+        return depth, score, move, searcher.nodes
+
+    table = TranspositionTable(table_entries, create=True)
+    stop_event = mp.Event()
+    results = mp.Queue()
+    processes = [
+        mp.Process(target=_worker,
+                   args=(i, board, table.name, table_entries, max_depth, node_limit, stop_event, results),
+                   daemon=True)
+        for i in range(workers)
+    ]
+    for process in processes:
+        process.start()
+
+    deadline = time.monotonic() + time_limit if time_limit is not None else None
+    best = (0, None, None)
+    finished, total_nodes = set(), 0
+    try:
+        while len(finished) < workers:
+            if deadline is not None and time.monotonic() >= deadline:
+                stop_event.set()
+                deadline = None  # Now just wait for workers to report back
+            try:
+                message = results.get(timeout=POLL_SECONDS)
+            except queue.Empty:
+                # A worker that died without reporting (killed, crashed on startup) is finished too
+                finished.update(i for i, process in enumerate(processes) if not process.is_alive())
+                continue
+            if message[0] == 'done':
+                finished.add(message[1])
+                total_nodes += message[2]
+                continue
+            _, worker_id, depth, score, move, _ = message
+            if depth > best[0]:
+                best = (depth, score, move)
+                if depth >= max_depth:
+                    stop_event.set()  # Someone finished the last iteration
+    finally:
+        stop_event.set()
+        for process in processes:
+            process.join()
+        table.close(unlink=True)
+    return best + (total_nodes,)
+
+
+def benchmark(board, max_depth, worker_counts=(1, 2, 4)):
+    # Time-to-depth for each worker count, with speedup relative to the first
+    rows = []
+    for workers in worker_counts:
+        start = time.perf_counter()
+        depth, score, move, nodes = parallel_search(board, max_depth, workers)
+        rows.append((workers, time.perf_counter() - start, depth, score, move, nodes))
+    base = rows[0][1]
+    return [row + (base / row[1],) for row in rows]
+
+
+if __name__ == '__main__':
+    import argparse
+
+    from logic.board import Board
+    from logic.notation import move_to_uci
+
+    parser = argparse.ArgumentParser(description="Lazy SMP search speedup report")
+    parser.add_argument("--fen", default=None, help="root position (default: start position)")
+    parser.add_argument("--depth", type=int, default=3)
+    parser.add_argument("--workers", default="1,2,4", help="comma-separated worker counts")
+    args = parser.parse_args()
+
+    root = Board.from_fen(args.fen) if args.fen else Board()
+    counts = [int(n) for n in args.workers.split(',')]
+    for workers, seconds, depth, score, move, nodes, speedup in benchmark(root, args.depth, counts):
+        best = move_to_uci(*move) if move else '-'
+        print(f"workers={workers:<3} time={seconds:7.2f}s depth={depth} score={score} "
+              f"best={best} nodes={nodes} speedup={speedup:.2f}x")
@@ -0,0 +1,241 @@
+import sys
+import threading
+import time
+
+from logic.board import Board
+from logic.notation import move_to_uci, parse_move
+from logic.search import MATE_SCORE, Search, TranspositionTable
+
+ENGINE_NAME = "Python Chess"
+ENGINE_AUTHOR = "Harsh Pathak"
+MAX_DEPTH = 64
+
+# While a search thread runs, let the command reader get the GIL back quickly
+# so 'isready' / 'stop' are answered well under a millisecond
+SEARCH_SWITCH_INTERVAL = 0.0002
+
+# 'go' arguments that take one integer value; anything else unknown is ignored
+GO_INT_ARGS = {'wtime', 'btime', 'winc', 'binc', 'movestogo', 'depth', 'nodes', 'mate', 'movetime'}
+GO_KEYWORDS = GO_INT_ARGS | {'searchmoves', 'ponder', 'infinite'}
+
+
+def format_score(score):
+    # UCI score from the side to move: 'cp 35' or 'mate 3' / 'mate -2'
+    if abs(score) >= MATE_SCORE - MAX_DEPTH:
+        plies = MATE_SCORE - abs(score)
+        moves = (plies + 1) // 2
+        return f"mate {moves if score > 0 else -moves}"
+    return f"cp {score}"
+
+
+class UCIEngine:
+    def __init__(self, output=None):
+        self.output = output or sys.stdout
+        self.output_lock = threading.Lock()
+        self.board = Board()
+        self.base = 'startpos'  # 'startpos' or the FEN the current moves start from
+        self.moves = []  # UCI moves applied to self.board since base
+        self.table = TranspositionTable()
+        self.search_thread = None
+        self.stop_event = threading.Event()
+
+    def send(self, line):
+        with self.output_lock:
+            self.output.write(line + "\n")
+            self.output.flush()
+
+    # ----------------------------------------------------------------- position
+
+    def set_position(self, base, moves):
+        # Apply only what changed: if the new move list shares a prefix with the
+        # current one, take back the extra moves and play the new ones
+        if base != self.base:
+            try:
+                board = Board() if base == 'startpos' else Board.from_fen(base)
+            except (KeyError, IndexError, ValueError):
+                self.send(f"info string invalid fen {base}")
+                return  # Keep the previous position
+            self.board, self.base, self.moves = board, base, []
+
+        common = 0
+        while common < min(len(moves), len(self.moves)) and moves[common] == self.moves[common]:
+            common += 1
+        while len(self.moves) > common:
+            self.board.undo_move()
+            self.moves.pop()
+        for move in moves[common:]:
+            try:
+                start, end, promotion = parse_move(move)
+            except ValueError:
+                self.send(f"info string illegal move {move}")
+                return
+            if (start, end) not in self.board.legal_moves() or not self.board.apply_move(start, end, promotion):
+                self.send(f"info string illegal move {move}")
+                return
+            self.moves.append(move)
+
+    def handle_position(self, tokens):
+        if 'moves' in tokens:
+            split = tokens.index('moves')
+            spec, moves = tokens[:split], tokens[split + 1:]
+        else:
+            spec, moves = tokens, []
+        if spec and spec[0] == 'fen':
+            base = " ".join(spec[1:])
+        else:
+            base = 'startpos'
+        self.set_position(base, moves)
+
+    # ------------------------------------------------------------------- search
+
+    def parse_go(self, tokens):
+        # Turn 'go' arguments into (depth, node_limit, seconds or None, infinite, root moves or None).
+        # Unknown or malformed arguments are skipped rather than stopping the engine.
+        args = {}
+        infinite = False
+        search_moves = None
+        i = 0
+        while i < len(tokens):
+            token = tokens[i]
+            i += 1
+            if token in ('infinite', 'ponder'):
+                infinite = True
+            elif token == 'searchmoves':
+                search_moves = []
+                while i < len(tokens) and tokens[i] not in GO_KEYWORDS:
+                    search_moves.append(tokens[i])
+                    i += 1
+            elif token in GO_INT_ARGS and i < len(tokens):
+                try:
+                    args[token] = int(tokens[i])
+                    i += 1
+                except ValueError:
+                    pass
+
+        depth = args.get('depth', MAX_DEPTH)
+        nodes = args.get('nodes')
+        seconds = None
+        if 'movetime' in args:
+            seconds = args['movetime'] / 1000
+        else:
+            side = 'w' if self.board.current_turn() == 'white' else 'b'
+            if f'{side}time' in args:
+                remaining = args[f'{side}time']
+                increment = args.get(f'{side}inc', 0)
+                moves_to_go = args.get('movestogo', 30)
+                seconds = max(0.01, (remaining / max(moves_to_go, 1) + increment / 2) / 1000)
+                seconds = min(seconds, remaining / 1000 / 2)
+        return depth, nodes, seconds, infinite, self.root_moves(search_moves)
+
+    def root_moves(self, search_moves):
+        # Legal (start, end, promotion) moves from a 'searchmoves' list; None searches everything
+        if not search_moves:
+            return None
+        legal = self.board.legal_moves()
+        moves = []
+        for move in search_moves:
+            try:
+                start, end, promotion = parse_move(move)
+            except ValueError:
+                continue
+            if (start, end) in legal:
+                if promotion is None and self.board.get_piece(*start).symbol == 'P' and end[0] in (0, 7):
+                    promotion = 'Q'
+                moves.append((start, end, promotion))
+        return moves or None
+
+    def run_search(self, depth, nodes, seconds, infinite, root_moves=None):
+        start_time = time.perf_counter()
+        searcher = Search(self.board, self.table, nodes, self.stop_event, root_moves)
+        timer = None
+        if seconds is not None:
+            timer = threading.Timer(seconds, self.stop_event.set)
+            timer.start()
+
+        def report(done_depth, score, move, node_count):
+            elapsed = max(time.perf_counter() - start_time, 1e-6)
+            pv = move_to_uci(*move) if move else ''
+            self.send(f"info depth {done_depth} score {format_score(score)} nodes {node_count} "
+                      f"time {int(elapsed * 1000)} nps {int(node_count / elapsed)} pv {pv}")
+
+        old_interval = sys.getswitchinterval()
+        sys.setswitchinterval(SEARCH_SWITCH_INTERVAL)
+        try:
+            _, _, move = searcher.iterative_deepening(depth, on_depth=report)
+            if move is None:
+                move = root_moves[0] if root_moves else self.fallback_move()
+            if infinite:
+                self.stop_event.wait()  # UCI: no bestmove before 'stop' in infinite mode
+        finally:
+            sys.setswitchinterval(old_interval)
+            if timer is not None:
+                timer.cancel()
+        self.send(f"bestmove {move_to_uci(*move) if move else '0000'}")
+
+    def fallback_move(self):
+        # Stopped before depth 1 finished: answer with any legal move
+        legal = self.board.legal_moves()
+        if not legal:
+            return None
+        start, end = legal[0]
+        promotion = 'Q' if self.board.get_piece(*start).symbol == 'P' and end[0] in (0, 7) else None
+        return start, end, promotion
+
+    def handle_go(self, tokens):
+        self.wait_for_search()
+        self.stop_event.clear()
+        self.search_thread = threading.Thread(target=self.run_search, args=self.parse_go(tokens), daemon=True)
+        self.search_thread.start()
+
+    def wait_for_search(self, stop=False):
+        if self.search_thread is not None:
+            if stop:
+                self.stop_event.set()
+            self.search_thread.join()
+            self.search_thread = None
+
+    # ----------------------------------------------------------------- commands
+
+    def handle(self, line):
+        # Process one command line; returns False on 'quit'
+        tokens = line.split()
+        if not tokens:
+            return True
+        command, args = tokens[0], tokens[1:]
+
+        if command == 'uci':
+            self.send(f"id name {ENGINE_NAME}")
+            self.send(f"id author {ENGINE_AUTHOR}")
+            self.send("uciok")
+        elif command == 'isready':
+            self.send("readyok")  # Never waits for the search thread
+        elif command == 'ucinewgame':
+            self.wait_for_search(stop=True)
+            self.table = TranspositionTable()
+            self.board, self.base, self.moves = Board(), 'startpos', []
+        elif command == 'position':
+            self.wait_for_search(stop=True)
+            self.handle_position(args)
+        elif command == 'go':
+            self.handle_go(args)
+        elif command == 'stop':
+            self.wait_for_search(stop=True)
+        elif command == 'quit':
+            self.wait_for_search(stop=True)
+            return False
+        return True
+
+    def run(self, stream=None):
+        # Reader loop: this thread only parses commands, searches run on their own thread
+        for line in stream or sys.stdin:
+            if not self.handle(line):
+                break
+        self.wait_for_search(stop=True)
+
+
+def main():
+    UCIEngine().run()
+
+
+if __name__ == '__main__':
+    main()
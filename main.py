@@ -1,6 +1,11 @@
+import multiprocessing
+
 from logic.board import Board
 from gui.gui import ChessGUI
 
-board = Board()
-gui = ChessGUI(board)
-gui.run()
+if __name__ == '__main__':
+    # Annotation worker processes re-import this module (spawn / PyInstaller builds)
+    multiprocessing.freeze_support()
+    board = Board()
+    gui = ChessGUI(board)
+    gui.run()
@@ -0,0 +1,94 @@
+import os
+import random
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pytest
+
+from logic.board import Board
+from logic.piece import Pawn
+
+FENS = [
+    "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1",
+    "r3k2r/pppq1ppp/2npbn2/4p3/4P3/2NPBN2/PPPQ1PPP/R3K2R w KQkq - 4 9",
+    "rnbqkbnr/ppp1p1pp/8/3pPp2/8/8/PPPP1PPP/RNBQKBNR w KQkq f6 0 3",
+    "8/2P3k1/8/8/8/8/5p2/4K3 b - - 0 60",
+]
+
+KNIGHT_SHUFFLE = [((7, 6), (5, 5)), ((0, 6), (2, 5)), ((5, 5), (7, 6)), ((2, 5), (0, 6))]
+
+
+def random_game(seed, plies=80):
+    # Seeded random legal game; returns the board and the (start, end, promotion) moves played
+    rng = random.Random(seed)
+    board = Board()
+    moves = []
+    for _ in range(plies):
+        legal = board.legal_moves()
+        if not legal:
+            break
+        start, end = rng.choice(legal)
+        promotion = rng.choice('QRBN') if isinstance(board.get_piece(*start), Pawn) and end[0] in (0, 7) else None
+        board.apply_move(start, end, promotion)
+        moves.append((start, end, promotion))
+    return board, moves
+
+
+@pytest.mark.parametrize("fen", FENS)
+def test_fen_round_trip(fen):
+    assert Board.from_fen(fen).to_fen() == fen
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_undo_restores_every_position(seed):
+    board, moves = random_game(seed)
+    states = []
+    replay = Board()
+    for move in moves:
+        states.append((replay.to_fen(), replay.get_draw_status()))
+        replay.apply_move(*move)
+    assert replay.to_fen() == board.to_fen()
+    while states:
+        replay.undo_move()
+        assert (replay.to_fen(), replay.get_draw_status()) == states.pop()
+
+
+def test_threefold_repetition_and_undo():
+    board = Board()
+    for move in KNIGHT_SHUFFLE * 2:
+        assert board.get_draw_status() is None
+        board.apply_move(*move)
+    assert board.get_draw_status() == 'threefold'
+    board.undo_move()
+    assert board.get_draw_status() is None
+
+
+def test_repetition_rebuilt_after_undoing_a_capture():
+    # Repeat twice, then capture and take it back: the third repetition still counts
+    board = Board.from_fen("4k3/8/8/8/8/8/3p4/R3K3 w - - 0 1")
+    shuffle = [((7, 0), (7, 1)), ((0, 4), (0, 3)), ((7, 1), (7, 0)), ((0, 3), (0, 4))]
+    for move in shuffle:
+        board.apply_move(*move)
+    board.apply_move((7, 4), (6, 3))  # Kxd2
+    assert board.position_history == [board.get_board_hash()]
+    board.undo_move()
+    for move in shuffle:
+        board.apply_move(*move)
+    assert board.get_draw_status() == 'threefold'
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_repetition_memory_bounded_by_reversible_window(seed):
+    board, _ = random_game(seed, plies=300)
+    assert len(board.move_history) > 100
+    assert len(board.position_history) <= board.halfmove_clock + 1
+    assert all(move["prev_window"] is None or isinstance(move["prev_window"], int)
+               for move in board.move_history)
+
+
+def test_checkmate_on_hundredth_quiet_ply():
+    board = Board.from_fen("6k1/5ppp/8/8/8/8/8/R5K1 w - - 99 80")
+    board.apply_move((7, 0), (0, 0))
+    assert board.is_checkmate('black')
+    assert board.get_draw_status() == 'fifty-move'  # Callers must test mate first
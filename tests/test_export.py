@@ -0,0 +1,59 @@
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+import pytest
+
+from logic.export import SHARD_FIELDS, ShardExporter, load_manifest, load_shard
+
+GAMES = [
+    ("e2e4 e7e5 g1f3 b8c6 f1b5 a7a6".split(), 1),
+    ("d2d4 d7d5 c2c4 e7e6 b1c3 g8f6 c1g5".split(), 0),
+    ("f2f3 e7e5 g2g4 d8h4".split(), -1),
+    ("c2c4 e7e5 b1c3 g8f6 g2g3 d7d5 c4d5 f6d5".split(), 1),
+]
+
+
+class Interrupted(Exception):
+    pass
+
+
+def interrupted_after(games, count):
+    # Yield the first count games, then fail as if the process had been killed
+    for index, game in enumerate(games):
+        if index == count:
+            raise Interrupted
+        yield game
+
+
+def read_all(directory):
+    manifest = load_manifest(directory)
+    return {field: np.concatenate([load_shard(directory, i)[field] for i in range(len(manifest['shards']))])
+            for field in SHARD_FIELDS}
+
+
+def test_illegal_game_is_skipped_and_export_finishes(tmp_path):
+    games = GAMES[:1] + [("e2e4 e7e5 e2e5 d2d4".split(), 0), ("e2e4 e9e5".split(), 0)] + GAMES[1:2]
+    manifest = ShardExporter(str(tmp_path), shard_size=4).export(games)
+    assert manifest['complete']
+    assert manifest['skipped'] == [[1, 2, 'e2e5'], [2, 1, 'e9e5']]
+    positions = sum(shard['positions'] for shard in manifest['shards'])
+    assert positions == (len(GAMES[0][0]) + 1) + (len(GAMES[1][0]) + 1)
+
+
+@pytest.mark.parametrize("stop_after", [1, 2, 3])
+def test_resume_after_interrupt_matches_clean_export(tmp_path, stop_after):
+    clean_dir, resumed_dir = str(tmp_path / 'clean'), str(tmp_path / 'resumed')
+    ShardExporter(clean_dir, shard_size=5).export(GAMES)
+
+    with pytest.raises(Interrupted):
+        ShardExporter(resumed_dir, shard_size=5).export(interrupted_after(GAMES, stop_after))
+    assert not load_manifest(resumed_dir)['complete']
+    ShardExporter(resumed_dir, shard_size=5).export(GAMES)
+
+    clean, resumed = read_all(clean_dir), read_all(resumed_dir)
+    for field in SHARD_FIELDS:
+        np.testing.assert_array_equal(clean[field], resumed[field])
+    assert load_manifest(resumed_dir)['shards'] == load_manifest(clean_dir)['shards']
@@ -0,0 +1,23 @@
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from logic.game import format_replay, replay
+
+
+def test_replay_stops_at_first_terminal_status():
+    shuffle = "g1f3 g8f6 f3g1 f6g8 g1f3 g8f6 f3g1 f6g8 e2e4".split()
+    plies, illegal, status, game = replay(shuffle)
+    assert (plies, illegal, status) == (8, None, 'threefold')
+    plies, illegal, status, game = replay("f2f3 e7e5 g2g4 d8h4".split())
+    assert (plies, illegal, status, game.current_player) == (4, None, 'checkmate', 'white')
+    plies, illegal, status, game = replay("e2e4 e7e5 e2e5 d2d4".split())
+    assert (plies, illegal, status) == (2, 2, 'ongoing')
+
+
+def test_format_replay_line():
+    moves = "f2f3 e7e5 g2g4 d8h4 a2a3".split()
+    plies, illegal, status, game = replay(moves)
+    assert format_replay(1, moves, plies, illegal, status, game) == \
+        "game 1: 4 plies, checkmate 0-1 (1 moves after the end ignored)\n"
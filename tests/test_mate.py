@@ -0,0 +1,50 @@
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pytest
+
+from logic.board import Board
+from logic.mate import parse_puzzle_line, solve_mate
+from logic.notation import parse_move
+
+MATE_IN_TWO = "k7/8/2K5/8/8/8/8/1R6 w - - 0 1"
+
+
+def test_mate_in_one():
+    result = solve_mate("6k1/5ppp/8/8/8/8/8/R5K1 w - - 0 1", 2)
+    assert (result['status'], result['moves'], result['line']) == ('mate', 1, ['a1a8'])
+
+
+def test_mate_in_two_line_ends_in_checkmate():
+    result = solve_mate(MATE_IN_TWO, 3)
+    assert (result['status'], result['moves']) == ('mate', 2)
+    board = Board.from_fen(MATE_IN_TWO)
+    for move in result['line']:
+        assert board.apply_move(*parse_move(move))
+    assert len(result['line']) == 3
+    assert board.is_checkmate(board.current_turn())
+
+
+@pytest.mark.parametrize("fen, max_moves", [
+    (MATE_IN_TWO, 1),  # Mate exists, but not within one move
+    ("rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1", 1),
+])
+def test_no_mate(fen, max_moves):
+    assert solve_mate(fen, max_moves)['status'] == 'no-mate'
+
+
+def test_node_budget_gives_unknown():
+    assert solve_mate(MATE_IN_TWO, 3, max_nodes=5)['status'] == 'unknown'
+
+
+def test_solver_leaves_board_unchanged():
+    board = Board.from_fen(MATE_IN_TWO)
+    solve_mate(board, 3)
+    assert board.to_fen() == MATE_IN_TWO and not board.move_history
+
+
+def test_parse_puzzle_line():
+    assert parse_puzzle_line(f"{MATE_IN_TWO}; 2\n", 3) == (MATE_IN_TWO, 2)
+    assert parse_puzzle_line(MATE_IN_TWO, 3) == (MATE_IN_TWO, 3)
@@ -0,0 +1,64 @@
+import os
+import pickle
+import random
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pytest
+
+from logic.board import Board
+from logic.piece import Pawn
+from logic.position import Position
+
+FENS = [
+    "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1",
+    "r3k2r/pppq1ppp/2npbn2/4p3/4P3/2NPBN2/PPPQ1PPP/R3K2R w KQkq - 4 9",
+    "rnbqkbnr/ppp1p1pp/8/3pPp2/8/8/PPPP1PPP/RNBQKBNR w KQkq f6 0 3",
+    "8/2P3k1/8/8/8/8/5p2/4K3 b - - 0 60",
+]
+
+
+def board_moves(board):
+    # Board.legal_moves with promotions spelled out, in Position.legal_moves form
+    moves = set()
+    for start, end in board.legal_moves():
+        if isinstance(board.get_piece(*start), Pawn) and end[0] in (0, 7):
+            moves.update((start, end, promotion) for promotion in 'QRBN')
+        else:
+            moves.add((start, end, None))
+    return moves
+
+
+@pytest.mark.parametrize("fen", FENS)
+def test_fen_round_trip(fen):
+    assert Position.from_fen(fen).to_fen() == fen
+    assert Position.from_board(Board.from_fen(fen)) == Position.from_fen(fen)
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_matches_board(seed):
+    rng = random.Random(seed)
+    board = Board()
+    position = Position.from_board(board)
+    for _ in range(80):
+        assert position.to_fen() == board.to_fen()
+        legal = board_moves(board)
+        assert set(position.legal_moves()) == legal
+        if not legal:
+            break
+        move = rng.choice(sorted(legal, key=str))
+        board.apply_move(*move)
+        position = position.apply(move)
+
+
+def test_immutable_hashable_and_picklable():
+    start = Position.from_board(Board())
+    after = start.apply('e2e4')
+    assert start == Position.from_board(Board())  # apply never mutates
+    assert after.en_passant == 5 * 8 + 4 and after.turn == 'b'
+    assert pickle.loads(pickle.dumps(after)) == after
+    # Transpositions meet on the same key; move clocks are left out of it
+    one = start.apply('g1f3').apply('g8f6').apply('b1c3')
+    other = start.apply('b1c3').apply('g8f6').apply('g1f3')
+    assert {one.key: 1}[other.key] == 1
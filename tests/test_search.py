@@ -0,0 +1,48 @@
+import os
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from logic.board import Board
+from logic.search import (MATE_SCORE, Search, TranspositionTable, parallel_search, score_from_table,
+                          score_to_table, search)
+from logic.uci import format_score
+
+MIDDLEGAME = "r3k2r/pppq1ppp/2npbn2/4p3/4P3/2NPBN2/PPPQ1PPP/R3K2R w KQkq - 4 9"
+
+
+def test_search_is_deterministic_at_fixed_node_count():
+    first = search(Board.from_fen(MIDDLEGAME), 4, node_limit=3000)
+    second = search(Board.from_fen(MIDDLEGAME), 4, node_limit=3000)
+    assert first == second
+    assert first[2] is not None
+
+
+def test_search_leaves_the_board_unchanged():
+    board = Board.from_fen(MIDDLEGAME)
+    search(board, 3, node_limit=2000)
+    assert board.to_fen() == MIDDLEGAME and not board.move_history
+
+
+def test_mate_scores_are_stored_relative_to_the_node():
+    score = MATE_SCORE - 5  # Mate 5 plies from the root, found 2 plies down
+    assert score_to_table(score, 2) == MATE_SCORE - 3
+    assert score_from_table(score_to_table(score, 2), 2) == score
+    assert score_from_table(score_to_table(-score, 4), 4) == -score
+    assert score_to_table(120, 7) == 120
+
+
+def test_mate_distance_survives_transpositions():
+    board = Board.from_fen("k7/8/2K5/8/8/8/8/1R6 w - - 0 1")
+    scores = []
+    Search(board, TranspositionTable(1 << 14)).iterative_deepening(
+        5, on_depth=lambda depth, score, move, nodes: scores.append(format_score(score)))
+    assert scores[3:] == ['mate 2', 'mate 2']
+
+
+def test_single_worker_honours_time_limit():
+    start = time.perf_counter()
+    depth, _, move, _ = parallel_search(Board(), 30, workers=1, time_limit=0.3)
+    assert time.perf_counter() - start < 2.0
+    assert depth >= 1 and move is not None
@@ -0,0 +1,67 @@
+import io
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from logic.board import Board
+from logic.notation import parse_move
+from logic.uci import UCIEngine, format_score
+
+
+def board_after(moves, fen=None):
+    board = Board.from_fen(fen) if fen else Board()
+    for move in moves:
+        board.apply_move(*parse_move(move))
+    return board
+
+
+def test_position_update_reuses_the_common_prefix():
+    engine = UCIEngine(io.StringIO())
+    engine.handle("position startpos moves e2e4 e7e5 g1f3")
+    first_entry = engine.board.move_history[0]
+    engine.handle("position startpos moves e2e4 e7e5 b1c3 b8c6")
+    # Only g1f3 was taken back; the shared moves were not replayed
+    assert engine.board.move_history[0] is first_entry
+    assert engine.moves == ["e2e4", "e7e5", "b1c3", "b8c6"]
+    assert engine.board.to_fen() == board_after(engine.moves).to_fen()
+    engine.handle("position startpos moves e2e4")
+    assert engine.board.to_fen() == board_after(["e2e4"]).to_fen()
+    assert engine.board.move_history[0] is first_entry
+
+
+def test_new_base_position_starts_over():
+    fen = "6k1/5ppp/8/8/8/8/8/R5K1 w - - 0 1"
+    engine = UCIEngine(io.StringIO())
+    engine.handle("position startpos moves e2e4")
+    engine.handle(f"position fen {fen} moves a1a8")
+    assert engine.board.to_fen() == board_after(["a1a8"], fen).to_fen()
+
+
+def test_bad_input_is_reported_and_keeps_the_position():
+    output = io.StringIO()
+    engine = UCIEngine(output)
+    engine.handle("position startpos moves e2e4")
+    engine.handle("position fen rnbqkbnr/ppppzppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1")
+    engine.handle("position fen")
+    assert engine.board.to_fen() == board_after(["e2e4"]).to_fen()
+    engine.handle("position startpos moves e2e4 e7e5 e2e9")
+    engine.handle("position startpos moves e2e4 f7f5 d1h5 g8f6")  # Ignores the check from h5
+    assert engine.moves == ["e2e4", "f7f5", "d1h5"]
+    lines = output.getvalue().splitlines()
+    assert [line.split()[2] for line in lines] == ["invalid", "invalid", "illegal", "illegal"]
+
+
+def test_parse_go_skips_bad_arguments_and_reads_searchmoves():
+    engine = UCIEngine(io.StringIO())
+    depth, nodes, seconds, infinite, root_moves = engine.parse_go(
+        "searchmoves e2e4 d2d4 e2e9 depth 3 nodes abc wibble 7".split())
+    assert (depth, nodes, seconds, infinite) == (3, None, None, False)
+    assert root_moves == [((6, 4), (4, 4), None), ((6, 3), (4, 3), None)]
+    assert engine.parse_go(["infinite"])[3] is True
+
+
+def test_format_score():
+    assert format_score(35) == "cp 35"
+    assert format_score(29997) == "mate 2"
+    assert format_score(-29998) == "mate -1"